@@ -18,12 +18,23 @@
 #
 
 import cloudpickle
+import numpy as np
+import pandas as pd
 from abc import ABCMeta, abstractmethod
-from typing import Callable, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Union
+
+from repair.utils import setup_logger
+
+
+_logger = setup_logger()
 
 
 class UpdateCostFunction(metaclass=ABCMeta):
 
+    # If True, `compute_batch` computes costs for a batch of values at once
+    vectorized: bool = False
+
     def __init__(self, targets: List[str] = []) -> None:
         self.targets: List[str] = targets
 
@@ -31,9 +42,92 @@ class UpdateCostFunction(metaclass=ABCMeta):
     def _compute_impl(self, x: Union[str, int, float], y: Union[str, int, float]) -> Optional[float]:
         pass
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Memoized costs are local to each process and not serialized
+        state = self.__dict__.copy()
+        state.pop('_cost_cache', None)
+        return state
+
     def compute(self, x: Optional[Union[str, int, float]], y: Optional[Union[str, int, float]]) -> Optional[float]:
         return self._compute_impl(x, y) if x and y else None
 
+    def compute_batch(self, xs: Sequence[Optional[Union[str, int, float]]],
+                      ys: Sequence[Optional[Union[str, int, float]]]) -> List[Optional[float]]:
+        """
+        Computes costs between each pair of values in `xs` and `ys`.
+        """
+        return [self.compute(x, y) for x, y in zip(xs, ys)]
+
+    def compute_costs(self, x: Optional[Union[str, int, float]], ys: Sequence[Optional[Union[str, int, float]]],
+                      cache_size: int = 0) -> List[Optional[float]]:
+        """
+        Computes costs between `x` and each value in `ys` (e.g., the domain of an attribute).
+        If `cache_size` is positive, the computed costs are memoized for each distinct
+        pair of `x` and a value in `ys`, and at most `cache_size` pairs are kept in a LRU manner.
+        """
+        if cache_size <= 0:
+            return [self.compute(x, y) for y in ys]
+
+        if not hasattr(self, '_cost_cache'):
+            self._cost_cache: OrderedDict = OrderedDict()
+
+        costs: List[Optional[float]] = []
+        for y in ys:
+            key = (x, y)
+            if key in self._cost_cache:
+                self._cost_cache.move_to_end(key)
+                costs.append(self._cost_cache[key])
+            else:
+                cost = self.compute(x, y)
+                self._cost_cache[key] = cost
+                if len(self._cost_cache) > cache_size:
+                    self._cost_cache.popitem(last=False)
+                costs.append(cost)
+
+        return costs
+
+    def compute_cost_rows(self, xs: Sequence[Optional[Union[str, int, float]]],
+                          candidates: Sequence[Optional[Sequence[Optional[Union[str, int, float]]]]],
+                          cache_size: int = 0) -> List[Optional[List[Optional[float]]]]:
+        """
+        Computes costs between each value in `xs` and each value in the corresponding
+        `candidates`. If this function is vectorized, all the pairs are computed
+        by a single call of :meth:`compute_batch`.
+        """
+        if not self.vectorized:
+            return [self.compute_costs(x, ys, cache_size) if x and ys is not None else None
+                    for x, ys in zip(xs, candidates)]
+
+        valid_rows = [i for i, (x, ys) in enumerate(zip(xs, candidates)) if x and ys is not None]
+        lengths = [len(candidates[i]) for i in valid_rows]  # type: ignore
+        xs_per_pair = np.repeat(np.array([xs[i] for i in valid_rows], dtype=object), lengths)
+        ys_per_pair = [y for i in valid_rows for y in candidates[i]]  # type: ignore
+        costs = self.compute_batch(xs_per_pair, ys_per_pair)
+
+        result: List[Optional[List[Optional[float]]]] = [None] * len(xs)
+        offsets = np.cumsum([0] + lengths)
+        for i, row in enumerate(valid_rows):
+            result[row] = costs[offsets[i]:offsets[i + 1]]
+
+        return result
+
+    def _compute_expr_impl(self, x: str, y: str) -> Optional[str]:
+        # Returns a Spark SQL expression computing a cost between `x` and `y` if the cost
+        # can be evaluated in JVMs; `None` means that it needs to be computed in Python.
+        return None
+
+    def compute_expr(self, x: str, y: str) -> Optional[str]:
+        """
+        Returns a Spark SQL expression that computes the same cost with :meth:`compute`
+        between the two given SQL expressions, or `None` if this function
+        cannot be evaluated without Python.
+        """
+        impl = self._compute_expr_impl(f'({x})', f'({y})')
+        if impl is None:
+            return None
+
+        return f"IF(({x}) IS NULL OR ({y}) IS NULL OR ({x}) = '' OR ({y}) = '', NULL, CAST({impl} AS DOUBLE))"
+
 
 class Levenshtein(UpdateCostFunction):
 
@@ -48,18 +142,141 @@ class Levenshtein(UpdateCostFunction):
         import Levenshtein
         return float(Levenshtein.distance(str(x), str(y)))
 
+    def _compute_expr_impl(self, x: str, y: str) -> Optional[str]:
+        return f'levenshtein(CAST({x} AS STRING), CAST({y} AS STRING))'
 
-class UserDefinedUpdateCostFunction(UpdateCostFunction):
 
-    def __init__(self, f: Callable[[str, str], float], targets: List[str] = []) -> None:
+class JaroWinkler(UpdateCostFunction):
+
+    def __init__(self, targets: List[str] = []) -> None:
         UpdateCostFunction.__init__(self, targets)
 
+    def __str__(self) -> str:
+        params = f'targets={",".join(self.targets)}' if self.targets else ''
+        return f'{self.__class__.__name__}({params})'
+
+    @staticmethod
+    def _jaro_similarity(s1: str, s2: str) -> float:
+        if not s1 and not s2:
+            return 1.0
+
+        match_distance = max(max(len(s1), len(s2)) // 2 - 1, 0)
+        s1_matches = [False] * len(s1)
+        s2_matches = [False] * len(s2)
+        num_matches = 0
+        for i in range(len(s1)):
+            for j in range(max(0, i - match_distance), min(i + match_distance + 1, len(s2))):
+                if not s2_matches[j] and s1[i] == s2[j]:
+                    s1_matches[i] = s2_matches[j] = True
+                    num_matches += 1
+                    break
+
+        if num_matches == 0:
+            return 0.0
+
+        num_transpositions = 0
+        k = 0
+        for i in range(len(s1)):
+            if s1_matches[i]:
+                while not s2_matches[k]:
+                    k += 1
+                if s1[i] != s2[k]:
+                    num_transpositions += 1
+                k += 1
+
+        m = float(num_matches)
+        return (m / len(s1) + m / len(s2) + (m - num_transpositions / 2.0) / m) / 3.0
+
+    def _compute_impl(self, x: Union[str, int, float], y: Union[str, int, float]) -> Optional[float]:
+        s1, s2 = str(x), str(y)
+        jaro = self._jaro_similarity(s1, s2)
+        prefix = 0
+        for c1, c2 in zip(s1[:4], s2[:4]):
+            if c1 != c2:
+                break
+            prefix += 1
+
+        return 1.0 - (jaro + prefix * 0.1 * (1.0 - jaro))
+
+    def _compute_expr_impl(self, x: str, y: str) -> Optional[str]:
+        # Registered by `RepairApi.registerCostFunctions`
+        return f'jaro_winkler_distance(CAST({x} AS STRING), CAST({y} AS STRING))'
+
+
+class QgramJaccard(UpdateCostFunction):
+
+    def __init__(self, q: int = 2, targets: List[str] = []) -> None:
+        UpdateCostFunction.__init__(self, targets)
+
+        if int(q) <= 0:
+            raise ValueError(f'`q` must be positive, but {q} got')
+
+        self.q = int(q)
+
+    def __str__(self) -> str:
+        params = [f'q={self.q}'] + ([f'targets={",".join(self.targets)}'] if self.targets else [])
+        return f'{self.__class__.__name__}({",".join(params)})'
+
+    def _qgrams(self, s: str) -> Set[str]:
+        return set(s[i:i + self.q] for i in range(len(s) - self.q + 1)) if len(s) > self.q else {s}
+
+    def _compute_impl(self, x: Union[str, int, float], y: Union[str, int, float]) -> Optional[float]:
+        qgrams1, qgrams2 = self._qgrams(str(x)), self._qgrams(str(y))
+        return 1.0 - len(qgrams1 & qgrams2) / len(qgrams1 | qgrams2)
+
+    def _compute_expr_impl(self, x: str, y: str) -> Optional[str]:
+        def _qgrams_expr(s: str, v: str) -> str:
+            return f'IF(length({s}) > {self.q}, ' \
+                f'transform(sequence(1, length({s}) - {self.q} + 1), {v} -> substr({s}, {v}, {self.q})), ' \
+                f'array({s}))'
+
+        qgrams1 = _qgrams_expr(f'CAST({x} AS STRING)', 'qx')
+        qgrams2 = _qgrams_expr(f'CAST({y} AS STRING)', 'qy')
+        return f'1.0D - size(array_intersect({qgrams1}, {qgrams2})) / size(array_union({qgrams1}, {qgrams2}))'
+
+
+class NumericDistance(UpdateCostFunction):
+
+    def __init__(self, targets: List[str] = []) -> None:
+        UpdateCostFunction.__init__(self, targets)
+
+    def __str__(self) -> str:
+        params = f'targets={",".join(self.targets)}' if self.targets else ''
+        return f'{self.__class__.__name__}({params})'
+
+    def _compute_impl(self, x: Union[str, int, float], y: Union[str, int, float]) -> Optional[float]:
         try:
-            ret = f('x', 'y')
-            if type(ret) is not float:
-                raise
-        except:
-            raise ValueError('`f` should take two values and return a float cost value')
+            return abs(float(x) - float(y))
+        except ValueError:
+            return None
+
+    def _compute_expr_impl(self, x: str, y: str) -> Optional[str]:
+        return f'abs(CAST({x} AS DOUBLE) - CAST({y} AS DOUBLE))'
+
+
+class UserDefinedUpdateCostFunction(UpdateCostFunction):
+
+    def __init__(self, f: Callable[[Any, Any], Any], targets: List[str] = [], vectorized: bool = False) -> None:
+        UpdateCostFunction.__init__(self, targets)
+
+        # If `vectorized` is True, `f` takes two string arrays and returns an array of costs
+        # so that the costs for a batch of values can be computed at once.
+        if vectorized:
+            try:
+                ret = np.asarray(f(np.array(['x', 'xx'], dtype=object), np.array(['y', 'yy'], dtype=object)))
+                if ret.shape != (2,) or not np.issubdtype(ret.dtype, np.number):
+                    raise
+            except:
+                raise ValueError('`f` should take two arrays and return an array of float cost values')
+        else:
+            try:
+                ret = f('x', 'y')
+                if type(ret) is not float:
+                    raise
+            except:
+                raise ValueError('`f` should take two values and return a float cost value')
+
+        self.vectorized = vectorized
 
         # NOTE: Uses cloudpickle here because `Spark.broadcast` cannot serialize
         # lambda functions using the built-in serializer.
@@ -69,10 +286,50 @@ class UserDefinedUpdateCostFunction(UpdateCostFunction):
         params = f'targets={",".join(self.targets)}' if self.targets else ''
         return f'{self.__class__.__name__}({params})'
 
-    def _compute_impl(self, x: Union[str, int, float], y: Union[str, int, float]) -> Optional[float]:
+    def _get_f(self) -> Callable[[Any, Any], Any]:
         if not hasattr(self, "_f"):
             self._f = cloudpickle.loads(self.pickled_f)
+        return self._f
+
+    def _compute_impl(self, x: Union[str, int, float], y: Union[str, int, float]) -> Optional[float]:
+        if self.vectorized:
+            return self.compute_batch([x], [y])[0]
         try:
-            return float(self._f(str(x), str(y)))
+            return float(self._get_f()(str(x), str(y)))
         except:
             return None
+
+    def compute_batch(self, xs: Sequence[Optional[Union[str, int, float]]],
+                      ys: Sequence[Optional[Union[str, int, float]]]) -> List[Optional[float]]:
+        if not self.vectorized:
+            return UpdateCostFunction.compute_batch(self, xs, ys)
+
+        xs_ser, ys_ser = pd.Series(list(xs), dtype=object), pd.Series(list(ys), dtype=object)
+        is_valid = (xs_ser.notna() & ys_ser.notna() & (xs_ser != '') & (ys_ser != '')).values
+        costs = np.full(len(xs_ser), np.nan)
+        if is_valid.any():
+            valid_xs = xs_ser[is_valid].astype(str).values
+            valid_ys = ys_ser[is_valid].astype(str).values
+            try:
+                costs[is_valid] = self._compute_vectorized(valid_xs, valid_ys)
+            except Exception as e:
+                # If `f` fails on the batch, falls back to computing costs row by row
+                # so that only the rows that `f` cannot handle have unknown costs (`None`).
+                _logger.warning(f"Failed to compute costs for a batch of {len(valid_xs)} values "
+                                f"because: {e.__class__}: {e}")
+                if len(valid_xs) > 1:
+                    costs[is_valid] = [self._compute_vectorized_row(x, y) for x, y in zip(valid_xs, valid_ys)]
+
+        return [None if np.isnan(c) else float(c) for c in costs]
+
+    def _compute_vectorized(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        ret = np.asarray(self._get_f()(xs, ys), dtype=np.float64)
+        if ret.shape != xs.shape:
+            raise ValueError(f'`f` should return {len(xs)} cost values, but got an array of shape {ret.shape}')
+        return ret
+
+    def _compute_vectorized_row(self, x: str, y: str) -> float:
+        try:
+            return float(self._compute_vectorized(np.array([x], dtype=object), np.array([y], dtype=object))[0])
+        except:
+            return np.nan
@@ -22,9 +22,9 @@ import json
 import numpy as np
 import pandas as pd
 from abc import ABCMeta, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from pyspark.sql import DataFrame, SparkSession, functions  # type: ignore
+from pyspark.sql import DataFrame, SparkSession  # type: ignore
 from pyspark.sql.types import StructType, StructField, StringType, IntegerType
 
 from repair.utils import get_option_value, get_random_string, setup_logger, \
@@ -251,12 +251,21 @@ class ScikitLearnBasedErrorDetector(ErrorDetector):
         broadcasted_columns = self._spark.sparkContext.broadcast(columns)
         broadcasted_clfs = self._spark.sparkContext.broadcast(outlier_detectors)
 
-        @functions.pandas_udf(output_schema, functions.PandasUDFType.GROUPED_MAP)
-        def predict(pdf: pd.DataFrame) -> pd.DataFrame:
+        def predict(pdfs: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
             row_id = broadcasted_row_id.value
             columns = broadcasted_columns.value
             clfs = broadcasted_clfs.value
 
+            # Fits a model once on all the rows in a partition (group); since `fit_predict` of
+            # outlier detectors (e.g., LOF) is transductive, the predictions of a row depend on
+            # the other rows in the same group, so the group cannot be processed batch by batch.
+            pdf_list = list(pdfs)
+            if not pdf_list:
+                return
+            pdf = pd.concat(pdf_list, ignore_index=True)
+            if len(pdf) == 0:
+                return
+
             _pdf = pdf[[row_id]]
             for c in columns:
                 # Since we assume a specified outlier detector cannot handle NaN cells,
@@ -264,13 +273,13 @@ class ScikitLearnBasedErrorDetector(ErrorDetector):
                 median = np.median(pdf[[c]].dropna())
                 _pdf[c] = clfs[c].fit_predict(pdf[[c]].fillna(median))
 
-            return _pdf
+            yield _pdf
 
-        # Sets a grouping key for inference
-        grouping_key = get_random_string("grouping_key")
-        grouping_key_expr = functions.rand() * functions.lit(self._num_parallelism)
-        input_df = input_df.withColumn(grouping_key, grouping_key_expr.cast("int"))
-        predicted_df = input_df.groupBy(grouping_key).apply(predict)
+        # Splits input rows into `num_parallelism` balanced groups (round-robin) so that
+        # each model is fitted on a random sample of the rows, regardless of the input partitioning.
+        # Only the row IDs and target columns are shuffled to bound the memory size of each group.
+        predicted_df = input_df.selectExpr(*[f'`{c}`' for c in [str(self.row_id)] + columns]) \
+            .repartition(self._num_parallelism).mapInPandas(predict, output_schema)
 
         def _extract_err_cells(col: str) -> Any:
             return predicted_df.where(f'{col} < 0').selectExpr(f'{self.row_id}', f'"{col}" attribute')
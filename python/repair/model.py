@@ -21,6 +21,7 @@ import copy
 import functools
 import heapq
 import json
+import math
 import pickle
 import numpy as np   # type: ignore[import]
 import pandas as pd  # type: ignore[import]
@@ -28,13 +29,14 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 from pyspark.sql import DataFrame, SparkSession, functions  # type: ignore[import]
 from pyspark.sql.functions import col, expr  # type: ignore[import]
-from pyspark.sql.types import ByteType, IntegerType, LongType, ShortType, \
+from pyspark.sql.types import ArrayType, ByteType, DoubleType, IntegerType, LongType, ShortType, \
     StringType, StructField, StructType  # type: ignore[import]
 
-from repair.costs import UpdateCostFunction
+from repair.costs import Levenshtein, UpdateCostFunction
 from repair.errors import ConstraintErrorDetector, ErrorDetector, ErrorModel, RegExErrorDetector
-from repair.train import build_model, compute_class_nrow_stdv, train_option_keys, rebalance_training_data
-from repair.utils import argtype_check, elapsed_time, get_option_value, get_random_string, \
+from repair.train import build_booster_on_shard, build_model, build_model_from_batches, compute_class_nrow_stdv, \
+    load_booster_model, train_option_keys, rebalance_training_data
+from repair.utils import argtype_check, elapsed_time, get_option_value, get_random_string, rebatch, \
     setup_logger, spark_job_group, to_list_str
 
 
@@ -61,6 +63,28 @@ class PoorModel():
         return [np.array([1.0])] * len(X)
 
 
+def _dedup_rows(X: pd.DataFrame) -> Tuple[pd.DataFrame, Any]:
+    # Dictionary-encodes each column, and then finds the distinct rows and
+    # the indexes to reconstruct `X` from them.
+    codes = np.column_stack([pd.factorize(X[c])[0] for c in X.columns])
+    _, index, inverse = np.unique(codes, axis=0, return_index=True, return_inverse=True)
+    return X.iloc[index], inverse
+
+
+def _to_prob_matrix(pmf: Any, num_classes: int) -> Tuple[Any, Any]:
+    # Some models return a list of probs having None for unknown inputs, so
+    # converts it into a dense matrix and a mask for known inputs.
+    if not isinstance(pmf, list):
+        probs = np.asarray(pmf, dtype=np.float64)
+        return probs, np.ones(len(probs), dtype=bool)
+
+    is_known = np.array([p is not None for p in pmf], dtype=bool)
+    probs = np.zeros((len(pmf), num_classes))
+    if is_known.any():
+        probs[is_known] = np.vstack([p for p in pmf if p is not None])
+    return probs, is_known
+
+
 class FunctionalDepModel():
     """
     Model class to mimic the scikit-learn APIs to predict values
@@ -79,27 +103,227 @@ class FunctionalDepModel():
         for index, c in enumerate(self.classes):
             self.fd_keypos_map[c] = index
 
+        # Dictionary-encodes `fd_map` for vectorized lookups
+        self.fd_keys = pd.Index(list(fd_map.keys()))
+        self.fd_codes = np.array([self.fd_keypos_map[v] for v in fd_map.values()], dtype=np.int64)
+
     @property
     def classes_(self) -> Any:
         return np.array(self.classes)
 
+    def _lookup(self, X: pd.DataFrame) -> Any:
+        # Returns class indexes for `X[self.x]` (-1 for unknown values)
+        positions = self.fd_keys.get_indexer(X[self.x])
+        if len(self.fd_codes) == 0:
+            return positions
+        return np.where(positions >= 0, self.fd_codes[positions], -1)
+
     def predict(self, X: pd.DataFrame) -> Any:
-        return list(map(lambda x: self.fd_map[x] if x in self.fd_map else None, X[self.x]))
+        codes = self._lookup(X)
+        return np.append(np.array(self.classes, dtype=object), None)[codes].tolist()
 
     def predict_proba(self, X: pd.DataFrame) -> Any:
-        pmf = []
-        for x in X[self.x]:
-            if x in self.fd_map.keys():
-                probs = np.zeros(len(self.classes))
-                probs[self.fd_keypos_map[self.fd_map[x]]] = 1.0
-                pmf.append(probs)
-            else:
-                _logger.warning(f'Unknown "{self.x}" domain value found: {x}')
-                pmf.append(None)  # type: ignore
-
+        codes = self._lookup(X)
+        is_known = codes >= 0
+        probs = np.zeros((len(codes), len(self.classes)))
+        probs[np.flatnonzero(is_known), codes[is_known]] = 1.0
+
+        if not is_known.all():
+            unknown_values = pd.unique(X[self.x].values[~is_known])
+            _logger.warning('{} unknown "{}" domain values found in {} rows: {}{}'.format(
+                len(unknown_values), self.x, int((~is_known).sum()),
+                to_list_str(unknown_values[:10]), ',...' if len(unknown_values) > 10 else ''))
+
+        pmf = list(probs)
+        for i in np.flatnonzero(~is_known):
+            pmf[i] = None
         return pmf
 
 
+class NaiveBayesModel():
+    """
+    Model class to mimic the scikit-learn APIs to predict values based on
+    the co-occurrence counts between a target and its features under
+    the naive conditional independence assumption.
+
+    .. versionchanged:: 0.1.0
+    """
+
+    def __init__(self, features: List[str], class_counts: Dict[Any, int],
+                 feature_counts: Dict[str, Dict[Any, Dict[Any, int]]], alpha: float = 1.0) -> None:
+        self.features = features
+        self.classes = list(class_counts.keys())
+        class_index = {c: i for i, c in enumerate(self.classes)}
+
+        # Computes smoothed log priors, i.e., log P(y)
+        counts = np.array([class_counts[c] for c in self.classes], dtype=np.float64)
+        self.log_priors = np.log((counts + alpha) / (counts.sum() + alpha * len(self.classes)))
+
+        # Computes smoothed log likelihoods, i.e., log P(x|y), for each feature `x`.
+        # The last row of each table is for unknown values and it does not affect posteriors.
+        self.value_indexes: Dict[str, Dict[Any, int]] = {}
+        self.log_likelihoods: Dict[str, Any] = {}
+        for x in features:
+            value_counts = feature_counts.get(x, {})
+            self.value_indexes[x] = {v: i for i, v in enumerate(value_counts.keys())}
+            table = np.zeros((len(value_counts) + 1, len(self.classes)))
+            for v, i in self.value_indexes[x].items():
+                for c, cnt in value_counts[v].items():
+                    table[i, class_index[c]] = cnt
+
+            table[:-1] = np.log((table[:-1] + alpha) / (table[:-1].sum(axis=0) + alpha * len(value_counts)))
+            self.log_likelihoods[x] = table
+
+    @property
+    def classes_(self) -> Any:
+        return np.array(self.classes)
+
+    def predict(self, X: pd.DataFrame) -> Any:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def predict_proba(self, X: pd.DataFrame) -> Any:
+        log_probs = np.tile(self.log_priors, (len(X), 1))
+        for x in self.features:
+            table = self.log_likelihoods[x]
+            indexes = X[x].map(self.value_indexes[x]).fillna(len(table) - 1).astype(np.int64)
+            log_probs += table[indexes.values]
+
+        # Normalizes the joint log probabilities into posteriors
+        log_probs -= log_probs.max(axis=1, keepdims=True)
+        probs = np.exp(log_probs)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+
+class LookupTableEncoder():
+    """
+    Encoder class to transform discrete columns with lookup tables compiled
+    from a fitted `category_encoders` encoder, e.g., `SumEncoder` and `OrdinalEncoder`.
+
+    .. versionchanged:: 0.1.0
+    """
+
+    def __init__(self, output_columns: List[str], output_dtypes: Dict[str, Any],
+                 lookup_tables: Dict[str, Tuple[pd.Index, Any, List[str]]],
+                 constants: Dict[str, Any]) -> None:
+        self.output_columns = output_columns
+        self.output_dtypes = output_dtypes
+        self.lookup_tables = lookup_tables
+        self.constants = constants
+
+        # Columns not encoded are just passed through
+        encoded_columns = [o for _, _, outputs in lookup_tables.values() for o in outputs]
+        self.passthrough_columns = [o for o in output_columns if o not in encoded_columns and o not in constants]
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        encoded: Dict[str, Any] = {}
+        for c, (categories, table, outputs) in self.lookup_tables.items():
+            # The last two rows of `table` are for unknown values and NULL respectively
+            codes = categories.get_indexer(X[c])
+            codes[codes < 0] = len(categories)
+            codes[X[c].isna().values] = len(categories) + 1
+            rows = table.take(codes, axis=0)
+            for i, o in enumerate(outputs):
+                encoded[o] = rows[:, i]
+
+        for o, v in self.constants.items():
+            encoded[o] = np.full(len(X), v)
+        for o in self.passthrough_columns:
+            encoded[o] = X[o].values
+
+        return pd.DataFrame(encoded, index=X.index, columns=self.output_columns).astype(self.output_dtypes)
+
+
+def compile_encoder(encoder: Any, X: pd.DataFrame, X_transformed: pd.DataFrame) -> Any:
+    """
+    Compiles a fitted encoder into `LookupTableEncoder` by probing it with the known categories,
+    an unknown value, and NULL for each encoded column. If the compiled one does not transform `X`
+    into `X_transformed` exactly, returns the given encoder as it is.
+    """
+    if len(X) == 0 or not hasattr(encoder, 'cols'):
+        return encoder
+
+    try:
+        lookup_tables: Dict[str, Tuple[pd.Index, Any, List[str]]] = {}
+        constants: Dict[str, Any] = {}
+        for c in encoder.cols:
+            categories = pd.Index(pd.unique(X[c].dropna()))
+            unknown = '__unknown__'
+            while unknown in categories:
+                unknown = f'_{unknown}_'
+
+            # Varies the values of `c` with the other columns fixed
+            probe = X.iloc[np.zeros(len(categories) + 2, dtype=np.int64)].reset_index(drop=True)
+            probe[c] = pd.Series(list(categories) + [unknown, None], dtype=object)
+            probed = encoder.transform(probe)
+
+            outputs = [o for o in probed.columns
+                       if o == c or (str(o).startswith(f'{c}_') and o not in X.columns)]
+            lookup_tables[c] = (categories, probed[outputs].values, outputs)
+            for o in probed.columns:
+                if o not in outputs and o not in X.columns:
+                    if probed[o].nunique(dropna=False) != 1:
+                        return encoder
+                    constants[o] = probed[o].iloc[0]
+
+        output_dtypes = {o: X_transformed[o].dtype for o in X_transformed.columns}
+        compiled = LookupTableEncoder(list(X_transformed.columns), output_dtypes, lookup_tables, constants)
+        if not compiled.transform(X).equals(X_transformed):
+            _logger.debug(f'Failed to compile {encoder.__class__.__name__}, so it is used as it is')
+            return encoder
+
+        return compiled
+    except Exception as e:
+        _logger.debug(f'Failed to compile {encoder.__class__.__name__} because: {e}')
+        return encoder
+
+
+class TrainedRepairModels():
+    """
+    Repair models built by :meth:`RepairModel.train`, which can be applied into
+    other input data having the same schema by :meth:`RepairModel.apply`.
+
+    .. versionchanged:: 0.1.0
+    """
+
+    def __init__(self, models: List[Any], target_columns: List[str], continous_columns: List[str],
+                 domain_stats: Dict[str, Any], nearest_value_domain_df: Optional[DataFrame] = None,
+                 functional_dep_maps: List[Tuple[str, str, DataFrame]] = []) -> None:
+        # A list of `(y, (model, features, transformers))` in prediction order
+        self.models = models
+        self.target_columns = target_columns
+        self.continous_columns = continous_columns
+        self.domain_stats = domain_stats
+        # Domains for the rule-based repairs, i.e., `(attribute, value)` pairs for repairs by nearest values
+        # and a list of `(x, y, fd_map_df)` for repairs by functional deps, found in the training data
+        self.nearest_value_domain_df = nearest_value_domain_df
+        self.functional_dep_maps = functional_dep_maps
+
+    def __str__(self) -> str:
+        return f'{self.__class__.__name__}(targets={",".join(self.target_columns)})'
+
+    def __enter__(self) -> 'TrainedRepairModels':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.unpersist()
+
+    @property
+    def features(self) -> List[str]:
+        return sorted(set(f for _, (_, features, _) in self.models for f in features))
+
+    def unpersist(self) -> None:
+        """
+        Releases the domains for the rule-based repairs cached in :meth:`RepairModel.train`.
+        The models can still be applied after that, but the domains are re-computed every time.
+
+        .. versionchanged:: 0.1.0
+        """
+        if self.nearest_value_domain_df is not None:
+            self.nearest_value_domain_df.unpersist()
+        for _, _, df in self.functional_dep_maps:
+            df.unpersist()
+
+
 class RepairModel():
     """
     Interface to detect error cells in given input data and build a statistical
@@ -118,6 +342,18 @@ class RepairModel():
     _opt_max_training_column_num = \
         _option('model.max_training_column_num', 65536, int,
                 lambda v: v >= 2, '`{}` should be greater than 1')
+    _opt_out_of_core_training_disabled = \
+        _option('model.out_of_core_training.disabled', True, bool,
+                None, None)
+    _opt_out_of_core_training_batch_size = \
+        _option('model.out_of_core_training.batch_size', 100000, int,
+                lambda v: v > 0, '`{}` should be positive')
+    _opt_distributed_training_disabled = \
+        _option('model.distributed_training.disabled', True, bool,
+                None, None)
+    _opt_distributed_training_num_workers = \
+        _option('model.distributed_training.num_workers', 0, int,
+                lambda v: v >= 0, '`{}` should be greater than or equal to 0')
     _opt_small_domain_threshold = \
         _option('model.small_domain_threshold', 12, int,
                 lambda v: v >= 3, '`{}` should be greater than 2')
@@ -130,12 +366,33 @@ class RepairModel():
     _opt_merge_threshold = \
         _option('model.rule.merge_threshold', 2.0, float,
                 None, None)
+    _opt_qgram_size = \
+        _option('model.rule.qgram_size', 2, int,
+                lambda v: v > 0, '`{}` should be positive')
     _opt_repair_by_functional_deps_disabled = \
         _option('model.rule.repair_by_functional_deps.disabled', False, bool,
                 None, None)
     _opt_max_domain_size = \
         _option('model.rule.max_domain_size', 1000, int,
                 lambda v: v > 10, '`{}` should be greater than 10')
+    _opt_discover_functional_deps_disabled = \
+        _option('model.rule.discover_functional_deps.disabled', True, bool,
+                None, None)
+    _opt_fd_entropy_threshold = \
+        _option('model.rule.fd_entropy_threshold', 0.05, float,
+                lambda v: v >= 0.0, '`{}` should be greater than or equal to 0.0')
+    _opt_fd_min_confidence = \
+        _option('model.rule.fd_min_confidence', 1.0, float,
+                lambda v: 0.0 < v <= 1.0, '`{}` should be in (0.0, 1.0]')
+    _opt_naive_bayes_disabled = \
+        _option('model.naive_bayes.disabled', True, bool,
+                None, None)
+    _opt_naive_bayes_entropy_threshold = \
+        _option('model.naive_bayes.entropy_threshold', 0.1, float,
+                lambda v: v >= 0.0, '`{}` should be greater than or equal to 0.0')
+    _opt_naive_bayes_alpha = \
+        _option('model.naive_bayes.alpha', 1.0, float,
+                lambda v: v > 0.0, '`{}` should be positive')
     _opt_cost_weight = \
         _option('repair.pmf.cost_weight', 0.1, float,
                 lambda v: v > 0.0, '`{}` should be positive')
@@ -145,19 +402,42 @@ class RepairModel():
     _opt_prob_top_k = \
         _option('repair.pmf.prob_top_k', 32, int,
                 lambda v: v >= 3, '`{}` should be greater than 2')
+    _opt_max_records_per_batch = \
+        _option('repair.udf.max_records_per_batch', 10000, int,
+                lambda v: v > 0, '`{}` should be positive')
+    _opt_dedup_inference_disabled = \
+        _option('repair.udf.dedup_inference.disabled', True, bool,
+                None, None)
+    _opt_cost_cache_size = \
+        _option('repair.cost.cache_size', 65536, int,
+                lambda v: v >= 0, '`{}` should be non-negative')
 
     option_keys = set([
         _opt_max_training_row_num.key,
         _opt_max_training_column_num.key,
+        _opt_out_of_core_training_disabled.key,
+        _opt_out_of_core_training_batch_size.key,
+        _opt_distributed_training_disabled.key,
+        _opt_distributed_training_num_workers.key,
         _opt_small_domain_threshold.key,
         _opt_repair_by_regex_disabled.key,
         _opt_repair_by_nearest_values_disabled.key,
         _opt_merge_threshold.key,
+        _opt_qgram_size.key,
         _opt_repair_by_functional_deps_disabled.key,
         _opt_max_domain_size.key,
+        _opt_discover_functional_deps_disabled.key,
+        _opt_fd_entropy_threshold.key,
+        _opt_fd_min_confidence.key,
+        _opt_naive_bayes_disabled.key,
+        _opt_naive_bayes_entropy_threshold.key,
+        _opt_naive_bayes_alpha.key,
         _opt_cost_weight.key,
         _opt_prob_threshold.key,
         _opt_prob_top_k.key,
+        _opt_max_records_per_batch.key,
+        _opt_dedup_inference_disabled.key,
+        _opt_cost_cache_size.key,
         *ErrorModel.option_keys,
         *train_option_keys])
 
@@ -423,6 +703,22 @@ class RepairModel():
         self.repair_by_rules = enabled
         return self
 
+    @argtype_check  # type: ignore
+    def setRepairValidation(self, enabled: bool) -> "RepairModel":
+        """Specifies whether to validate repair candidates with the denial constraints given by
+           :class:`ConstraintErrorDetector`. If enabled, the repair candidates have an additional
+           column `rejected_reason` that describes why a repair is rejected.
+
+        .. versionchanged:: 0.1.0
+
+        Parameters
+        ----------
+        enabled: bool
+            If set to ``True``, checks if the constraints hold in repaired rows (default: ``False``).
+        """
+        self.repair_validation_enabled = enabled
+        return self
+
     @argtype_check  # type: ignore
     def setRepairDelta(self, delta: int) -> "RepairModel":
         """Specifies the max number of applied repairs.
@@ -502,6 +798,23 @@ class RepairModel():
         return not bool(self._get_option_value(*self._opt_repair_by_functional_deps_disabled)) \
             and self.repair_by_rules
 
+    @property
+    def _out_of_core_training_enabled(self) -> bool:
+        return not bool(self._get_option_value(*self._opt_out_of_core_training_disabled))
+
+    @property
+    def _distributed_training_enabled(self) -> bool:
+        return not bool(self._get_option_value(*self._opt_distributed_training_disabled))
+
+    @property
+    def _functional_deps_discovery_enabled(self) -> bool:
+        return not bool(self._get_option_value(*self._opt_discover_functional_deps_disabled)) \
+            and self._repair_by_functional_deps_enabled
+
+    @property
+    def _naive_bayes_model_enabled(self) -> bool:
+        return not bool(self._get_option_value(*self._opt_naive_bayes_disabled))
+
     def _delete_view_on_exit(self, view_name: str) -> None:
         self._intermediate_views_on_runtime.append(view_name)
 
@@ -562,40 +875,70 @@ class RepairModel():
         fields = [row_id_field] + list(map(lambda n: StructField(n, StringType()), field_names))
         return self._empty_dataframe(StructType(fields))
 
+    def _has_native_cost_func(self) -> bool:
+        assert self.cf is not None
+        if self.cf.compute_expr('x', 'y') is None:
+            return False
+
+        # Registers the built-in cost functions that are not in Spark
+        self._repair_api.registerCostFunctions()
+        return True
+
     def _create_cost_func(self) -> Any:
+        # Returns a function that computes the costs between a value and candidates
+        # given as SQL expressions. The built-in cost functions are evaluated in JVMs
+        # and only user-defined ones are computed in Python UDFs.
+        if self._has_native_cost_func():
+            def native_cost_func(x: str, ys: str) -> Any:
+                cost_expr = self.cf.compute_expr(x, 'candidate')  # type: ignore
+                return expr(f"IF(({x}) IS NOT NULL AND ({x}) != '' AND ({ys}) IS NOT NULL, "
+                            f"transform({ys}, candidate -> {cost_expr}), NULL)")
+            return native_cost_func
+
         broadcasted_cf = self._spark.sparkContext.broadcast(self.cf)
 
+        # Since candidates come from small per-attribute domains, the same cost rows
+        # are memoized in Python workers and shared across cells and batches.
+        # If the cost function is vectorized, it is called once per Arrow batch instead.
+        cost_cache_size = int(self._get_option_value(*self._opt_cost_cache_size))
+
         @functions.pandas_udf("array<double>", functions.PandasUDFType.SCALAR)
         def cost_func(s1: pd.Series, s2: pd.Series) -> pd.Series:
             cf = broadcasted_cf.value
+            return pd.Series(cf.compute_cost_rows(s1.values, s2.values, cost_cache_size))  # type: ignore
 
-            result: List[Optional[List[float]]] = []
-            for target, candidates in zip(s1, s2):
-                if target and candidates is not None:
-                    result.append([cf.compute(target, c) for c in candidates])  # type: ignore
-                else:
-                    result.append(None)
-
-            return pd.Series(result)
+        return lambda x, ys: cost_func(expr(x), expr(ys))
 
-        return cost_func
-
-    def _repair_by_nearest_values(self, repair_base_df: DataFrame,
-                                  error_cells_df: DataFrame,
-                                  target_columns: List[str]) -> Tuple[DataFrame, DataFrame]:
+    def _compute_nearest_value_domains(self, repair_base_df: DataFrame,
+                                       target_columns: List[str]) -> Optional[DataFrame]:
         assert self.cf is not None
 
         cf_targets = self.cf.targets  # type: ignore
         targets = list(filter(lambda c: c in cf_targets, target_columns)) \
             if cf_targets else target_columns
         if not targets:
+            return None
+
+        return functools.reduce(lambda x, y: x.union(y), map(
+            lambda c: repair_base_df.where(f'`{c}` IS NOT NULL')
+            .selectExpr(f'"{c}" attribute', f'CAST(`{c}` AS STRING) value'), targets)) \
+            .distinct()
+
+    def _repair_by_nearest_values(self, domain_df: Optional[DataFrame],
+                                  error_cells_df: DataFrame) -> Tuple[DataFrame, DataFrame]:
+        assert self.cf is not None
+
+        if domain_df is None:
             row_id_field = error_cells_df.schema[self._row_id]
             return error_cells_df, self._empty_repaired_cells_dataframe(row_id_field)
 
+        # For edit distances, only the domain values passing a q-gram count filter
+        # are compared with the current values instead of the whole domain.
+        if isinstance(self.cf, Levenshtein):
+            return self._repair_by_nearest_values_with_qgram_filter(domain_df, error_cells_df)
+
         cost_func = self._create_cost_func()
-        compute_dvs = lambda c: repair_base_df.where(f'`{c}` IS NOT NULL') \
-            .selectExpr(f'"{c}" attribute', f'collect_set(`{c}`) dvs')
-        domain_df = functools.reduce(lambda x, y: x.union(y), map(compute_dvs, targets))
+        domain_df = domain_df.groupBy('attribute').agg(expr('collect_set(value) dvs'))
 
         repair_merge_threshold = self._get_option_value(*self._opt_merge_threshold)
 
@@ -608,7 +951,7 @@ class RepairModel():
         repair_expr = f'if(dvs[0].cost <= {repair_merge_threshold} AND dvs[0].cost < dvs[1].cost, ' \
             'dvs[0].value, null) repaired'
         error_cells_df = error_cells_df.join(domain_df, 'attribute', 'left_outer') \
-            .withColumn("costs", cost_func(col("current_value"), col("dvs"))) \
+            .withColumn("costs", cost_func("current_value", "dvs")) \
             .selectExpr(f"`{self._row_id}`", "attribute", "current_value", 'dvs value', 'costs cost') \
             .selectExpr(f"`{self._row_id}`", "attribute", "current_value", 'arrays_zip(value, cost) dvs') \
             .selectExpr(f"`{self._row_id}`", "attribute", "current_value", sorted_domain_value_expr) \
@@ -621,14 +964,73 @@ class RepairModel():
 
         return error_cells_df, repaired_cells_df
 
-    def _repair_by_regex(self, regex: str, target: str, error_cells_df: DataFrame) -> DataFrame:
-        error_cells = self._create_temp_view(error_cells_df, 'error_cells')
-        jdf = self._repair_api.repairByRegularExpression(regex, target, error_cells, self._row_id)
-        return DataFrame(jdf, self._spark._wrapped)  # type: ignore
+    def _repair_by_nearest_values_with_qgram_filter(self, domain_df: DataFrame,
+                                                    error_cells_df: DataFrame) -> Tuple[DataFrame, DataFrame]:
+        assert self.cf is not None
 
-    def _repair_by_regexs(self, repair_base_df: DataFrame,
-                          error_cells_df: DataFrame,
-                          target_columns: List[str]) -> Tuple[DataFrame, DataFrame]:
+        repair_merge_threshold = float(self._get_option_value(*self._opt_merge_threshold))
+        q = int(self._get_option_value(*self._opt_qgram_size))
+        k = int(math.floor(repair_merge_threshold))
+
+        # Note that `domain_df` is not cached here because the returned repairs are evaluated lazily
+        # and no point is left to release it; `train` caches it and keeps it in the returned models.
+        current_values_df = error_cells_df.where('current_value IS NOT NULL') \
+            .selectExpr(f"`{self._row_id}`", "attribute", "current_value")
+
+        # If an edit distance between two strings s and t is at most k, they share at least
+        # max(|s|, |t|) - q + 1 - k * q q-grams (a count filter) and ||s| - |t|| <= k holds
+        # (a length filter). The former is meaningless for short strings, so they are
+        # compared with the short domain values only by the length filter.
+        qgrams_expr = lambda v: f'IF(length({v}) >= {q}, ' \
+            f'transform(sequence(1, length({v}) - {q} + 1), i -> substr({v}, i, {q})), ' \
+            'CAST(array() AS ARRAY<STRING>)) qgrams'
+
+        def _count_qgrams(df: DataFrame, keys: List[str], v: str) -> DataFrame:
+            return df.selectExpr(*keys, qgrams_expr(v)) \
+                .selectExpr(*keys, 'explode(qgrams) qgram') \
+                .groupBy(*keys, 'qgram').count()
+
+        domain_qgrams_df = _count_qgrams(domain_df, ['attribute', 'value'], 'value') \
+            .withColumnRenamed('count', 'domain_count')
+        current_qgrams_df = _count_qgrams(
+            current_values_df, [f'`{self._row_id}`', 'attribute', 'current_value'], 'current_value') \
+            .withColumnRenamed('count', 'current_count')
+        length_filter = f'abs(length(current_value) - length(value)) <= {k}'
+        count_filter = f'shared_count >= greatest(length(current_value), length(value)) - {q} + 1 - {k * q}'
+        qgram_candidates_df = current_qgrams_df.join(domain_qgrams_df, ['attribute', 'qgram'], 'inner') \
+            .groupBy(self._row_id, 'attribute', 'current_value', 'value') \
+            .agg(expr('sum(least(current_count, domain_count)) shared_count')) \
+            .where(f'{length_filter} AND {count_filter}') \
+            .selectExpr(f"`{self._row_id}`", 'attribute', 'current_value', 'value')
+
+        short_length = k * q + q - 1
+        short_candidates_df = current_values_df.where(f'length(current_value) <= {short_length}') \
+            .join(domain_df.where(f'length(value) <= {short_length}'), 'attribute', 'inner') \
+            .where(length_filter) \
+            .selectExpr(f"`{self._row_id}`", 'attribute', 'current_value', 'value')
+
+        # Selects the nearest value if it is unique within the threshold; the values not in
+        # the candidates are farther than the threshold, so the nearest one is also unique
+        # in the whole domain if the domain has more than one value.
+        cost_expr = self.cf.compute_expr('current_value', 'value')
+        domain_size_df = domain_df.groupBy('attribute').agg(expr('count(1) domain_size'))
+        repair_expr = 'if(size(dvs) = 1, domain_size >= 2, dvs[0].cost < dvs[1].cost)'
+        repaired_cells_df = qgram_candidates_df.union(short_candidates_df).distinct() \
+            .selectExpr(f"`{self._row_id}`", 'attribute', 'current_value', 'value', f'{cost_expr} cost') \
+            .where(f'cost <= {repair_merge_threshold}') \
+            .groupBy(self._row_id, 'attribute', 'current_value') \
+            .agg(expr("array_sort(collect_list(named_struct('cost', cost, 'value', value))) dvs")) \
+            .join(domain_size_df, 'attribute', 'inner') \
+            .where(repair_expr) \
+            .selectExpr(f"`{self._row_id}`", 'attribute', 'current_value', 'dvs[0].value repaired')
+
+        error_cells_df = error_cells_df \
+            .join(repaired_cells_df.select(self._row_id, 'attribute'), [self._row_id, 'attribute'], 'left_anti') \
+            .selectExpr(f"`{self._row_id}`", "attribute", "current_value")
+
+        return error_cells_df, repaired_cells_df
+
+    def _repair_by_regexs(self, error_cells_df: DataFrame) -> Tuple[DataFrame, DataFrame]:
         regex_detectors = list(filter(lambda x: isinstance(x, RegExErrorDetector), self.error_detectors))
         if not regex_detectors:
             row_id_field = error_cells_df.schema[self._row_id]
@@ -637,22 +1039,103 @@ class RepairModel():
         regexs = list(map(lambda d: (d.attr, d.regex), regex_detectors))  # type: ignore
         _logger.info(f'[Repairing Phase] Repairing data using regexs: {to_list_str(regexs)}')
 
-        dfs: List[DataFrame] = []
-        for attr, regex in regexs:
-            target_error_cells_df = error_cells_df.where(f"attribute = '{attr}'")
-            df = self._repair_by_regex(regex, attr, target_error_cells_df)
-            dfs.append(df.where('repaired IS NOT NULL'))
+        # All the regexs are compiled once and applied in a single pass over the error cells
+        error_cells = self._create_temp_view(error_cells_df, 'error_cells')
+        jdf = self._repair_api.repairByRegularExpressions(json.dumps(regexs), error_cells, self._row_id)
 
         # TODO: Might need to check if edit distances between `current_value` and `repaired`
         # are enough minimal for repairs.
+        repaired_cells_df = DataFrame(jdf, self._spark._wrapped).where('repaired IS NOT NULL')  # type: ignore
+        error_cells_df = error_cells_df.join(repaired_cells_df, [self._row_id, 'attribute'], "left_anti")
+
+        return error_cells_df, repaired_cells_df
+
+    def _compute_functional_dep_maps(self, repair_base_df: DataFrame,
+                                     target_columns: List[str],
+                                     domain_stats: Dict[str, str]) -> List[Tuple[str, str, DataFrame]]:
+        train_df = repair_base_df.drop(self._row_id)
+        functional_deps = self._get_functional_deps(train_df, target_columns, [])
+        if not functional_deps:
+            return []
+
+        # The functional deps whose determinants have small domains are handled by `FunctionalDepModel`
+        # in the repair model training phase. For large-domain determinants, collecting and broadcasting
+        # their maps are too expensive, so error cells are repaired by joining them with the maps instead.
+        max_domain_size = int(self._get_option_value(*self._opt_max_domain_size))
+        is_small_domain = lambda x: x in domain_stats and int(domain_stats[x]) < max_domain_size
+        fd_pairs = [(functional_deps[y][0], y) for y in target_columns
+                    if y in functional_deps and len(functional_deps[y]) > 0
+                    and not any(is_small_domain(x) for x in functional_deps[y])]
+        if not fd_pairs:
+            return []
+
+        _logger.info('[Repairing Phase] Repairing data by joining functional dep maps: {}'.format(
+            to_list_str(list(map(lambda p: f"{p[0]}->{p[1]}", fd_pairs)))))
+
+        input_view = self._create_temp_view(train_df, 'input_to_compute_fd_map')
+        fd_maps: List[Tuple[str, str, DataFrame]] = []
+        for x, y in fd_pairs:
+            jdf = self._repair_api.computeFunctionalDepMapAsDataFrame(input_view, x, y)
+            fd_maps.append((x, y, DataFrame(jdf, self._spark._wrapped)))  # type: ignore
+
+        return fd_maps
+
+    def _repair_by_functional_deps(self, repair_base_df: DataFrame,
+                                   error_cells_df: DataFrame,
+                                   functional_dep_maps: List[Tuple[str, str, DataFrame]]) \
+            -> Tuple[DataFrame, DataFrame]:
+        if not functional_dep_maps:
+            row_id_field = error_cells_df.schema[self._row_id]
+            return error_cells_df, self._empty_repaired_cells_dataframe(row_id_field)
+
+        dfs: List[DataFrame] = []
+        for x, y, fd_map_df in functional_dep_maps:
+            # Since error cells are cleared out to NULL in `repair_base_df`,
+            # only clean `x` values are used to repair `y` cells.
+            df = error_cells_df.where(f"attribute = '{y}'") \
+                .join(repair_base_df.selectExpr(f"`{self._row_id}`", f"CAST(`{x}` AS STRING) x"),
+                      self._row_id, "inner") \
+                .join(fd_map_df, "x", "inner") \
+                .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "y repaired")
+            dfs.append(df)
+
         repaired_cells_df = functools.reduce(lambda x, y: x.union(y), dfs)
         error_cells_df = error_cells_df.join(repaired_cells_df, [self._row_id, 'attribute'], "left_anti")
 
         return error_cells_df, repaired_cells_df
 
+    def _repair_distinct_values(self, repair_func: Any, error_cells_df: DataFrame) -> Tuple[DataFrame, DataFrame]:
+        # Since the rule-based repairs are deterministic for each value, `repair_func` is applied
+        # only into distinct (attribute, current_value) pairs and the repaired values are joined
+        # back into the error cells. A hash of the pair is used as a row ID of the distinct values.
+        distinct_values_df = error_cells_df.where('current_value IS NOT NULL') \
+            .selectExpr('attribute', 'current_value') \
+            .distinct() \
+            .selectExpr(f'xxhash64(attribute, current_value) `{self._row_id}`', 'attribute', 'current_value')
+        _, repaired_values_df = repair_func(distinct_values_df)
+        repaired_cells_df = error_cells_df \
+            .join(repaired_values_df.selectExpr('attribute', 'current_value', 'repaired'),
+                  ['attribute', 'current_value'], 'inner') \
+            .selectExpr(f"`{self._row_id}`", 'attribute', 'current_value', 'repaired')
+        error_cells_df = error_cells_df \
+            .join(repaired_cells_df.select(self._row_id, 'attribute'), [self._row_id, 'attribute'], 'left_anti')
+
+        return error_cells_df, repaired_cells_df
+
+    def _compute_rule_based_repair_domains(self, repair_base_df: DataFrame,
+                                           target_columns: List[str],
+                                           domain_stats: Dict[str, str]) \
+            -> Tuple[Optional[DataFrame], List[Tuple[str, str, DataFrame]]]:
+        nearest_value_domain_df = self._compute_nearest_value_domains(repair_base_df, target_columns) \
+            if self._repair_by_nearest_values_enabled else None
+        functional_dep_maps = self._compute_functional_dep_maps(repair_base_df, target_columns, domain_stats) \
+            if self._repair_by_functional_deps_enabled else []
+        return nearest_value_domain_df, functional_dep_maps
+
     def _repair_by_rules(self, repair_base_df: DataFrame,
                          error_cells_df: DataFrame,
-                         target_columns: List[str]) -> Tuple[DataFrame, DataFrame]:
+                         nearest_value_domain_df: Optional[DataFrame],
+                         functional_dep_maps: List[Tuple[str, str, DataFrame]]) -> Tuple[DataFrame, DataFrame]:
         repaired_cells_dfs: List[DataFrame] = []
 
         # Adds an empty dataframe for unioning result repaired dataframes
@@ -660,15 +1143,20 @@ class RepairModel():
         repaired_cells_dfs.append(self._empty_repaired_cells_dataframe(row_id_field))
 
         if self._repair_by_regex_enabled:
-            error_cells_df, repaired_by_regex_df = \
-                self._repair_by_regexs(repair_base_df, error_cells_df, target_columns)
+            error_cells_df, repaired_by_regex_df = self._repair_distinct_values(
+                self._repair_by_regexs, error_cells_df)
             repaired_cells_dfs.append(repaired_by_regex_df)
 
         if self._repair_by_nearest_values_enabled:
-            error_cells_df, repaired_by_nv_df = \
-                self._repair_by_nearest_values(repair_base_df, error_cells_df, target_columns)
+            error_cells_df, repaired_by_nv_df = self._repair_distinct_values(
+                lambda df: self._repair_by_nearest_values(nearest_value_domain_df, df), error_cells_df)
             repaired_cells_dfs.append(repaired_by_nv_df)
 
+        if self._repair_by_functional_deps_enabled:
+            error_cells_df, repaired_by_fd_df = \
+                self._repair_by_functional_deps(repair_base_df, error_cells_df, functional_dep_maps)
+            repaired_cells_dfs.append(repaired_by_fd_df)
+
         repaired_by_rules_df = functools.reduce(lambda x, y: x.union(y), repaired_cells_dfs)
         return error_cells_df, repaired_by_rules_df
 
@@ -728,12 +1216,63 @@ class RepairModel():
 
         return transformers
 
-    def _build_rule_model(self, train_df: DataFrame, target_columns: List[str], x: str, y: str) -> Any:
-        # TODO: For attributes having large domain size, we need to rewrite it as a join query to repair data
+    def _fit_transformers(self, transformers: List[Any], X: pd.DataFrame) -> pd.DataFrame:
+        # Fits the transformers in order and then replaces them with compiled ones
+        # for faster feature transformation in inference.
+        for i, transformer in enumerate(transformers):
+            X_transformed = transformer.fit_transform(X)
+            transformers[i] = compile_encoder(transformer, X, X_transformed)
+            X = X_transformed
+
+        return X
+
+    def _build_rule_model(self, train_df: DataFrame, target_columns: List[str], x: str, y: str,
+                          min_confidence: float = 1.0) -> Any:
+        # NOTE: For attributes having large domain size, see `_repair_by_functional_deps`
+        # that repairs data by a join query.
         input_view = self._create_temp_view(train_df, 'rule_model_input')
-        func_deps = json.loads(self._repair_api.computeFunctionalDepMap(input_view, x, y))
+        func_deps = json.loads(self._repair_api.computeFunctionalDepMap(input_view, x, y, min_confidence))
         return FunctionalDepModel(x, func_deps)
 
+    def _has_cyclic_functional_deps(self, models: Dict[str, Any], x: str, y: str) -> bool:
+        # Follows the chain of the rule models from `x` to check if it reaches `y`
+        while x in models and isinstance(models[x][0], FunctionalDepModel):
+            x = models[x][0].x
+            if x == y:
+                return True
+        return False
+
+    def _discover_rule_model(self, train_df: DataFrame, y: str, continous_columns: List[str],
+                             domain_stats: Dict[str, str], pairwise_attr_stats: Dict[str, str],
+                             models: Dict[str, Any]) -> Optional[Any]:
+        # The conditional entropy H(y|x) is zero if and only if `x` determines `y` (x->y), so the attributes
+        # whose entropies are (nearly) zero are candidates of exact (or approximate) functional deps.
+        if y not in pairwise_attr_stats:
+            return None
+
+        entropy_threshold = float(self._get_option_value(*self._opt_fd_entropy_threshold))
+        min_confidence = float(self._get_option_value(*self._opt_fd_min_confidence))
+        max_domain_size = int(self._get_option_value(*self._opt_max_domain_size))
+        candidates = sorted([
+            (float(h), x) for x, h in map(lambda x: tuple(x), pairwise_attr_stats[y])  # type: ignore
+            if float(h) <= entropy_threshold and x in train_df.columns and x not in continous_columns
+            and x in domain_stats and int(domain_stats[x]) < max_domain_size])
+
+        for h, x in candidates:
+            if self._has_cyclic_functional_deps(models, x, y):
+                continue
+
+            # Verifies the candidate on training data; the map from `x` to `y` must cover
+            # all the `x` values that appear together with `y` values.
+            model = self._build_rule_model(train_df, [], x, y, min_confidence)
+            num_x_values = train_df.where(f"`{x}` IS NOT NULL AND `{y}` IS NOT NULL") \
+                .selectExpr(f"count(distinct `{x}`) cnt").collect()[0].cnt
+            if len(model.fd_map) > 0 and len(model.fd_map) == num_x_values:
+                _logger.debug(f"Functional dep discovered: {x}->{y} (H({y}|{x})={h})")
+                return model
+
+        return None
+
     def _get_functional_deps(self, train_df: DataFrame, target_columns: List[str],
                              continous_columns: List[str]) -> Optional[Dict[str, List[str]]]:
         constraint_detectors = list(filter(lambda x: isinstance(x, ConstraintErrorDetector), self.error_detectors))
@@ -752,6 +1291,53 @@ class RepairModel():
         else:
             return None
 
+    def _select_naive_bayes_features(self, pairwise_attr_stats: Dict[str, str], domain_stats: Dict[str, str],
+                                     y: str, features: List[str], continous_columns: List[str]) -> List[str]:
+        # The conditional entropy H(y|x) is the uncertainty of `y` remaining after observing `x`.
+        # If it is small enough for one of the features, a statistical model (e.g., LightGBM) has
+        # little room to improve accuracy over a Naive Bayes one, so we select the latter
+        # to skip the expensive training costs.
+        if y not in pairwise_attr_stats:
+            return []
+
+        # Since the co-occurrence counts between `y` and each feature are collected into the driver,
+        # we only use the attributes in the pairwise stats whose domain sizes are small enough.
+        max_domain_size = int(self._get_option_value(*self._opt_max_domain_size))
+        entropy_map = {x: float(h) for x, h in map(lambda x: tuple(x), pairwise_attr_stats[y])}  # type: ignore
+        discrete_features = [c for c in features if c not in continous_columns and c in entropy_map
+                             and c in domain_stats and int(domain_stats[c]) < max_domain_size]
+        entropy_threshold = float(self._get_option_value(*self._opt_naive_bayes_entropy_threshold))
+        if len(discrete_features) == 0 or min(entropy_map[x] for x in discrete_features) > entropy_threshold:
+            return []
+
+        return discrete_features
+
+    def _build_naive_bayes_model(self, train_df: DataFrame, y: str, features: List[str]) -> Any:
+        # Computes the class counts of `y` and the co-occurrence counts between `y` and each feature
+        # in a single aggregation, i.e., GROUPING SETS ((y), (y, x_1), ..., (y, x_n)).
+        input_view = self._create_temp_view(train_df, 'naive_bayes_model_input')
+        grouping_sets = ", ".join([f"(`{y}`)"] + [f"(`{y}`, `{x}`)" for x in features])
+        grouping_exprs = ", ".join([f"`{x}`, grouping(`{x}`) `__grouping_{i}`" for i, x in enumerate(features)])
+        rows = self._spark.sql(f"""
+            SELECT `{y}`, {grouping_exprs}, COUNT(1) cnt
+            FROM {input_view}
+            WHERE `{y}` IS NOT NULL
+            GROUP BY GROUPING SETS ({grouping_sets})
+        """).collect()
+
+        class_counts: Dict[Any, int] = {}
+        feature_counts: Dict[str, Dict[Any, Dict[Any, int]]] = {x: {} for x in features}
+        for row in rows:
+            grouped_features = [x for i, x in enumerate(features) if row[f'__grouping_{i}'] == 0]
+            if len(grouped_features) == 0:
+                class_counts[row[y]] = row.cnt
+            elif row[grouped_features[0]] is not None:
+                value_counts = feature_counts[grouped_features[0]]
+                value_counts.setdefault(row[grouped_features[0]], {})[row[y]] = row.cnt
+
+        alpha = float(self._get_option_value(*self._opt_naive_bayes_alpha))
+        return NaiveBayesModel(features, class_counts, feature_counts, alpha)
+
     def _sample_training_data_from(self, df: DataFrame, training_data_num: int) -> DataFrame:
         # The value of `_opt_max_training_row_num` highly depends on
         # the performance of pandas and LightGBM.
@@ -765,6 +1351,103 @@ class RepairModel():
         # TODO: Needs more smart sampling, e.g., stratified sampling
         return df.sample(sampling_ratio)
 
+    def _iterate_training_batches(self, df: DataFrame, columns: List[str]) -> Any:
+        # Streams training data into the driver partition-by-partition, and then
+        # yields them as pandas DataFrames whose size is at most `batch_size`.
+        batch_size = int(self._get_option_value(*self._opt_out_of_core_training_batch_size))
+        rows: List[Any] = []
+        for row in df.selectExpr(*map(lambda c: f"`{c}`", columns)).toLocalIterator(prefetchPartitions=False):
+            rows.append(row)
+            if len(rows) >= batch_size:
+                yield pd.DataFrame.from_records(rows, columns=columns)
+                rows = []
+        if len(rows) > 0:
+            yield pd.DataFrame.from_records(rows, columns=columns)
+
+    def _task_cpus(self) -> int:
+        # Python workers cannot get the number of cores assigned to a task (`TaskContext.cpus`
+        # is not available in Spark v3.2), so reads it in the driver and passes it into UDFs.
+        return int(self._spark.sparkContext.getConf().get("spark.task.cpus", "1"))
+
+    def _num_executors(self) -> int:
+        try:
+            # The number includes a driver if running on a cluster
+            num_executors = self._spark._jsc.sc().getExecutorMemoryStatus().size()  # type: ignore
+            return max(1, num_executors - 1)
+        except:
+            return 1
+
+    @elapsed_time  # type: ignore
+    def _build_distributed_stat_model(self, df: DataFrame, y: str, features: List[str], transformers: List[Any],
+                                      base_model: Any, classes: Optional[List[Any]], training_data_num: int) -> Any:
+        num_workers = int(self._get_option_value(*self._opt_distributed_training_num_workers))
+        num_workers = num_workers if num_workers > 0 else self._num_executors()
+        # Each worker needs at least one row to train on
+        num_workers = max(1, min(num_workers, training_data_num))
+        columns = features + [y]
+
+        # Computes the class weights on the whole training data if necessary
+        class_weights = None
+        if classes is not None and base_model.get_params().get("class_weight") == "balanced":
+            class_counts = df.groupBy(f"`{y}`").count().collect()
+            num_rows = sum(map(lambda r: r[1], class_counts))
+            class_weights = {r[0]: float(num_rows) / (len(classes) * r[1]) for r in class_counts}
+
+        task_cpus = self._task_cpus()
+        _logger.info(f"Launching {num_workers} LightGBM workers in a barrier stage...")
+
+        def train(it):  # type: ignore
+            import socket
+            from pyspark import BarrierTaskContext  # type: ignore[import]
+            context = BarrierTaskContext.get()
+            pdf = pd.DataFrame.from_records(list(it), columns=columns)
+
+            # Finds a free port to listen on, and then shares the address with the other workers.
+            # Workers having an empty shard do not join the LightGBM network.
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.bind(("", 0))
+                listen_port = sock.getsockname()[1]
+            host = context.getTaskInfos()[context.partitionId()].address.split(":")[0]
+            address = f"{host}:{listen_port}" if len(pdf) > 0 else ""
+            machines = [m for m in context.allGather(address) if m]
+
+            model_str = None
+            if len(pdf) > 0:
+                model_str = build_booster_on_shard(
+                    pdf, features, y, transformers, classes, class_weights, base_model,
+                    machines, listen_port, n_jobs=task_cpus)
+
+            context.barrier()
+            yield context.partitionId(), len(pdf), model_str if address == machines[0] else None
+
+        # Rows are evenly distributed into the workers by a round-robin repartitioning
+        results = df.selectExpr(*map(lambda c: f"`{c}`", columns)).repartition(num_workers) \
+            .rdd.barrier().mapPartitions(train).collect()
+        shard_sizes = [nrows for _, nrows, _ in sorted(results)]
+        _logger.info("Trained '{}' model on {} shards in a barrier stage (#rows={})".format(
+            y, len(list(filter(lambda n: n > 0, shard_sizes))), to_list_str(shard_sizes)))
+        model_strs = [model_str for _, _, model_str in results if model_str is not None]
+        assert len(model_strs) == 1
+        return load_booster_model(model_strs[0], classes)
+
+    def _build_stat_model_on_whole_data(self, df: DataFrame, y: str, features: List[str], transformers: List[Any],
+                                        base_model: Any, is_discrete: bool, training_data_num: int) -> Any:
+        # Builds a model with the hyperparameters of `base_model` (found on sampled training data)
+        # by using all the training data in a distributed way or by streaming them into LightGBM.
+        classes = sorted(map(lambda r: r[0], df.selectExpr(f"`{y}`").distinct().collect())) \
+            if is_discrete else None
+        _logger.info("Re-building '{}' model on the whole training data (#rows={})...".format(
+            y, training_data_num))
+        if self._distributed_training_enabled:
+            model, elapsed_time = self._build_distributed_stat_model(
+                df, y, features, transformers, base_model, classes, training_data_num)
+        else:
+            batches = self._iterate_training_batches(df, features + [y])
+            model, elapsed_time = build_model_from_batches(
+                batches, features, y, transformers, classes, base_model, n_jobs=-1)
+        _logger.info("Finishes re-building '{}' model... elapsed={}s".format(y, elapsed_time))
+        return model
+
     def _build_repair_stat_models_in_series(
             self, models: Dict[str, Any], train_df: DataFrame,
             target_columns: List[str], continous_columns: List[str],
@@ -786,9 +1469,7 @@ class RepairModel():
             is_discrete = y not in continous_columns
             model_type = "classfier" if is_discrete else "regressor"
 
-            X = train_pdf[feature_map[y]]  # type: ignore
-            for transformer in transformer_map[y]:
-                X = transformer.fit_transform(X)
+            X = self._fit_transformers(transformer_map[y], train_pdf[feature_map[y]])
             _logger.debug("{} encoders transform ({})=>({})".format(
                 len(transformer_map[y]), to_list_str(feature_map[y]), to_list_str(X.columns)))
 
@@ -810,6 +1491,14 @@ class RepairModel():
             _logger.info("Finishes building '{}' model...  score={} elapsed={}s".format(
                 y, score, elapsed_time))
 
+            # If training data is sampled, re-builds the model on the whole training data
+            # without loading it into a single pandas DataFrame.
+            max_training_row_num = int(self._get_option_value(*self._opt_max_training_row_num))
+            if (self._out_of_core_training_enabled or self._distributed_training_enabled) and \
+                    training_data_num > max_training_row_num and not isinstance(model, PoorModel):
+                model = self._build_stat_model_on_whole_data(
+                    df, y, feature_map[y], transformer_map[y], model, is_discrete, training_data_num)
+
             models[y] = (model, feature_map[y], transformer_map[y])
 
         return models
@@ -822,6 +1511,7 @@ class RepairModel():
             transformer_map: Dict[str, List[Any]]) -> Dict[str, Any]:
         # To build repair models in parallel, it assigns each model training into a single task
         train_dfs_per_target: List[DataFrame] = []
+        whole_train_dfs: Dict[str, Tuple[DataFrame, int]] = {}
         target_column = get_random_string("target_column")
 
         for y in [c for c in target_columns if c not in models]:
@@ -835,15 +1525,14 @@ class RepairModel():
                 models[y] = (PoorModel(None), feature_map[y], None)
                 continue
 
+            whole_train_dfs[y] = (df, training_data_num)
             df = self._sample_training_data_from(df, training_data_num)
             train_dfs_per_target.append(df.withColumn(target_column, functions.lit(y)))
 
             # TODO: Removes duplicate feature transformations
             train_pdf = df.toPandas()
-            X = train_pdf[feature_map[y]]  # type: ignore
             transformers = transformer_map[y]
-            for transformer in transformers:
-                X = transformer.fit_transform(X)
+            X = self._fit_transformers(transformers, train_pdf[feature_map[y]])
             _logger.debug("{} encoders transform ({})=>({})".format(
                 len(transformers), to_list_str(feature_map[y]), to_list_str(X.columns)))
 
@@ -858,18 +1547,6 @@ class RepairModel():
         if num_tasks == 0:
             return models
 
-        # TODO: A larger `training_n_jobs` value can cause high pressure on executors
-        def _num_cores_per_executor() -> int:
-            try:
-                num_parallelism = self._spark.sparkContext.defaultParallelism
-                num_executors = self._spark._jsc.sc().getExecutorMemoryStatus().size()  # type: ignore
-                return max(1, num_parallelism / num_executors)
-            except:
-                return 1
-
-        training_n_jobs = max(1, int(_num_cores_per_executor() / num_tasks))
-        _logger.debug(f"Setting {training_n_jobs} to `n_jobs` for training in parallel")
-
         broadcasted_target_column = self._spark.sparkContext.broadcast(target_column)
         broadcasted_continous_columns = self._spark.sparkContext.broadcast(continous_columns)
         broadcasted_feature_map = self._spark.sparkContext.broadcast(feature_map)
@@ -877,8 +1554,8 @@ class RepairModel():
         broadcasted_num_class_map = self._spark.sparkContext.broadcast(num_class_map)
         broadcasted_training_data_rebalancing_enabled = \
             self._spark.sparkContext.broadcast(self.training_data_rebalancing_enabled)
-        broadcasted_n_jobs = self._spark.sparkContext.broadcast(training_n_jobs)
         broadcasted_opts = self._spark.sparkContext.broadcast(self.opts)
+        task_cpus = self._task_cpus()
 
         @functions.pandas_udf("target: STRING, model: BINARY, score: DOUBLE, elapsed: DOUBLE, nrows: INT, stdv: DOUBLE",
                               functions.PandasUDFType.GROUPED_MAP)
@@ -891,7 +1568,6 @@ class RepairModel():
             is_discrete = y not in continous_columns
             num_class = broadcasted_num_class_map.value[y]
             training_data_rebalancing_enabled = broadcasted_training_data_rebalancing_enabled.value
-            n_jobs = broadcasted_n_jobs.value
             opts = broadcasted_opts.value
 
             X = pdf[features]
@@ -902,7 +1578,8 @@ class RepairModel():
             X, y_ = rebalance_training_data(X, pdf[y], y) if is_discrete and training_data_rebalancing_enabled \
                 else (X, pdf[y])
 
-            ((model, score), elapsed_time) = build_model(X, y_, is_discrete, num_class, n_jobs, opts)
+            # The number of cores used for training is bounded by `spark.task.cpus`
+            ((model, score), elapsed_time) = build_model(X, y_, is_discrete, num_class, task_cpus, opts)
             if model is None:
                 model = PoorModel(None)
 
@@ -923,6 +1600,17 @@ class RepairModel():
             transformers = transformer_map[row.target]
             models[row.target] = (model, features, transformers)
 
+        # If training data is sampled, re-builds the models on the whole training data
+        # one by one because each of them runs distributed jobs or uses all the cores in the driver.
+        max_training_row_num = int(self._get_option_value(*self._opt_max_training_row_num))
+        if self._out_of_core_training_enabled or self._distributed_training_enabled:
+            for y, (df, training_data_num) in whole_train_dfs.items():
+                model, features, transformers = models[y]
+                if training_data_num > max_training_row_num and not isinstance(model, PoorModel):
+                    model = self._build_stat_model_on_whole_data(
+                        df, y, features, transformers, model, y not in continous_columns, training_data_num)
+                    models[y] = (model, features, transformers)
+
         return models
 
     def _resolve_prediction_order(self, models: Dict[str, Any], target_columns: List[str]) -> List[Any]:
@@ -1020,13 +1708,38 @@ class RepairModel():
                     # Checks if the domain size of `x` is small enough
                     return int(domain_stats[x]) < int(self._get_option_value(*self._opt_max_domain_size))
 
-                fx = list(filter(lambda x: _qualified(x), functional_deps[y]))
+                fx = list(filter(lambda x: _qualified(x) and not self._has_cyclic_functional_deps(models, x, y),
+                                 functional_deps[y]))
                 if len(fx) > 0:
                     _logger.info("Building {}/{} model... type=rule(FD: X->y)  y={}(|y|={}) X={}(|X|={})".format(
                         index, len(target_columns), y, num_class_map[y], fx[0], domain_stats[fx[0]]))
                     model = self._build_rule_model(train_df, target_columns, fx[0], y)
                     models[y] = (model, [fx[0]], None)
 
+            # If `y` is functionally-dependent on one of the attributes found in the pairwise
+            # entropy stats, builds a model based on the discovered rule.
+            if y not in models and is_discrete and self._functional_deps_discovery_enabled:
+                model = self._discover_rule_model(
+                    train_df, y, continous_columns, domain_stats, pairwise_attr_stats, models)
+                if model is not None:
+                    _logger.info("Building {}/{} model... type=rule(discovered FD: X->y)  y={}(|y|={}) "
+                                 "X={}(|X|={})".format(
+                                     index, len(target_columns), y, num_class_map[y],
+                                     model.x, domain_stats[model.x]))
+                    models[y] = (model, [model.x], None)
+
+            # If `y` is almost determined by one of the features, builds a Naive Bayes model
+            # from the co-occurrence counts instead of training a statistical model.
+            if y not in models and is_discrete and self._naive_bayes_model_enabled:
+                features = self._select_features(pairwise_attr_stats, y, input_columns)  # type: ignore
+                features = self._select_naive_bayes_features(
+                    pairwise_attr_stats, domain_stats, y, features, continous_columns)
+                if len(features) > 0:
+                    _logger.info("Building {}/{} model... type=naive_bayes y={} features={} #class={}".format(
+                        index, len(target_columns), y, to_list_str(features), num_class_map[y]))
+                    model = self._build_naive_bayes_model(train_df, y, features)
+                    models[y] = (model, features, None)
+
         if len(models) != len(target_columns):
             # Selects features among input columns if necessary
             feature_map: Dict[str, List[str]] = {}
@@ -1051,20 +1764,26 @@ class RepairModel():
 
         return list(models.items())
 
-    def _group_apply(self, df: DataFrame, udf: Any) -> DataFrame:
-        num_parallelism = self._spark.sparkContext.defaultParallelism
-        grouping_key = get_random_string("grouping_key")
-        return df.withColumn(grouping_key, (functions.rand() * functions.lit(num_parallelism)).cast("int")) \
-            .groupBy(grouping_key).apply(udf)
+    def _map_in_batches(self, df: DataFrame, f: Any, schema: StructType) -> DataFrame:
+        # Applies `f` into each partition in batches without shuffling rows
+        batch_size = int(self._get_option_value(*self._opt_max_records_per_batch))
+
+        def _map_func(pdfs: Any) -> Any:
+            for pdf in rebatch(pdfs, batch_size):
+                output_pdf = f(pdf)
+                if len(output_pdf) > 0:
+                    yield output_pdf
+
+        return df.mapInPandas(_map_func, schema)
 
     # TODO: What is the best way to repair appended new data if we have already
     # clean (or repaired) data?
     @spark_job_group(name="repairing")
     def _repair(self, models: List[Any], continous_columns: List[str],
                 dirty_rows_df: DataFrame, error_cells_df: DataFrame,
-                compute_repair_candidate_prob: bool, maximal_likelihood_repair: bool) -> pd.DataFrame:
+                compute_repair_candidate_prob: bool, maximal_likelihood_repair: bool,
+                prune_pmf: bool = False, long_format: bool = True) -> pd.DataFrame:
         # Shares all the variables for the learnt models in a Spark cluster
-        broadcasted_columns = self._spark.sparkContext.broadcast(dirty_rows_df.columns)
         broadcasted_continous_columns = self._spark.sparkContext.broadcast(continous_columns)
         broadcasted_models = self._spark.sparkContext.broadcast(models)
         broadcasted_compute_repair_candidate_prob = \
@@ -1091,46 +1810,144 @@ class RepairModel():
         integral_column_map = _create_integral_column_map(dirty_rows_df.schema)
         broadcasted_integral_column_map = self._spark.sparkContext.broadcast(integral_column_map)
 
+        # If `long_format` is True, the `repair` UDF outputs only the predicted cells
+        # in a long format keyed by (row_id, attribute). String values are stored in `repaired`
+        # and numeric ones are in `repaired_num`; the latter are cast back into their original types
+        # in Spark so that they have the same string representations with the other cells.
+        # For discrete targets, the UDF also outputs probability mass functions (PMFs) in
+        # the two extra typed columns: an array of classes and an array of their probs.
+        # Note that Arrow-based UDFs in Spark cannot return an array of structs.
+        need_to_compute_pmf = compute_repair_candidate_prob or maximal_likelihood_repair
+        assert long_format or not need_to_compute_pmf, 'PMFs can be computed only in a long format'
+        if long_format:
+            output_schema = StructType([
+                dirty_rows_df.schema[self._row_id],
+                StructField('attribute', StringType()),
+                StructField('repaired', StringType()),
+                StructField('repaired_num', DoubleType())])
+            if need_to_compute_pmf:
+                output_schema.add(StructField('classes', ArrayType(StringType())))
+                output_schema.add(StructField('probs', ArrayType(DoubleType())))
+        else:
+            output_schema = StructType(dirty_rows_df.schema.fields)
+
+        string_columns = [f.name for f in dirty_rows_df.schema.fields if f.dataType == StringType()]
+        broadcasted_columns = self._spark.sparkContext.broadcast(output_schema.names)
+        broadcasted_string_columns = self._spark.sparkContext.broadcast(string_columns)
+
+        # If `prune_pmf` is True, the UDF filters out less-confident candidates
+        # and outputs the top-k ones sorted by their probs.
+        pmf_pruning_params = None
+        if prune_pmf:
+            pmf_pruning_params = (float(self._get_option_value(*self._opt_prob_threshold)),
+                                  int(self._get_option_value(*self._opt_prob_top_k)))
+        broadcasted_pmf_pruning_params = self._spark.sparkContext.broadcast(pmf_pruning_params)
+
+        # If enabled, the UDF runs predictions only once for each distinct feature combination
+        dedup_inference_enabled = not bool(self._get_option_value(*self._opt_dedup_inference_disabled))
+
         # TODO: Runs the `repair` UDF based on checkpoint files
-        @functions.pandas_udf(dirty_rows_df.schema, functions.PandasUDFType.GROUPED_MAP)
         def repair(pdf: pd.DataFrame) -> pd.DataFrame:
             columns = broadcasted_columns.value
+            string_columns = broadcasted_string_columns.value
             continous_columns = broadcasted_continous_columns.value
             integral_column_map = broadcasted_integral_column_map.value
             models = broadcasted_models.value
             compute_repair_candidate_prob = broadcasted_compute_repair_candidate_prob.value
             maximal_likelihood_repair = broadcasted_maximal_likelihood_repair.value
+            pmf_pruning_params = broadcasted_pmf_pruning_params.value
 
-            # An internal PMF format is like '{"classes": ["dog", "cat"], "probs": [0.76, 0.24]}'
             need_to_compute_pmf = compute_repair_candidate_prob or maximal_likelihood_repair
+            row_id = columns[0]
+            repaired_cells = []
 
             for m in models:
                 (y, (model, features, transformers)) = m
 
-                # Preprocesses the input row for prediction
-                X = pdf[features]
-
-                # Transforms an input row to a feature
-                if transformers:
-                    for transformer in transformers:
-                        X = transformer.transform(X)
-
-                if need_to_compute_pmf and y not in continous_columns:
-                    # TODO: Filters out top-k values to reduce the amount of data
-                    predicted = model.predict_proba(X)
-
-                    def _to_dict(probs):  # type: ignore
-                        return {"classes": model.classes_.tolist(), "probs": probs.tolist()} if probs is not None \
-                            else {"classes": [], "probs": []}
-
-                    pmf = map(lambda p: _to_dict(p), predicted)
-                    pmf = map(lambda p: json.dumps(p), pmf)  # type: ignore
-                    pdf[y] = pdf[y].where(pdf[y].notna(), list(pmf))
-                else:
-                    predicted = model.predict(X)
-                    predicted = predicted if y not in integral_column_map \
-                        else np.round(predicted).astype(integral_column_map[y])
-                    pdf[y] = pdf[y].where(pdf[y].notna(), predicted)
+                # Only the rows whose target is NULL (error cells) need to be predicted
+                error_rows = np.flatnonzero(pdf[y].isna().values)
+                compute_pmf = need_to_compute_pmf and y not in continous_columns
+
+                if len(error_rows) > 0:
+                    # Preprocesses the input row for prediction
+                    X = pdf[features].iloc[error_rows]
+
+                    # Many error rows can share the same features, so predicts only distinct ones
+                    # and then scatters the results by `inverse`.
+                    inverse = None
+                    if dedup_inference_enabled and len(features) > 0 and len(error_rows) > 1:
+                        X, inverse = _dedup_rows(X)
+
+                    # Transforms an input row to a feature
+                    if transformers:
+                        for transformer in transformers:
+                            X = transformer.transform(X)
+
+                    y_index = pdf.columns.get_loc(y)
+
+                    if compute_pmf:
+                        pmf_classes = np.full(len(error_rows), None, dtype=object)
+                        pmf_probs = np.full(len(error_rows), None, dtype=object)
+                        # Note that `PoorModel(None)` has a NULL class, so it is kept as NULL (not 'None')
+                        classes = np.array([c if c is None else str(c) for c in model.classes_], dtype=object)
+                        predicted, is_known = _to_prob_matrix(model.predict_proba(X), len(classes))
+                        if inverse is not None:
+                            predicted, is_known = predicted[inverse], is_known[inverse]
+                        if pmf_pruning_params is not None:
+                            prob_threshold, prob_top_k = pmf_pruning_params
+                            top_k = min(prob_top_k, len(classes))
+                            top_k_indices = np.argpartition(-predicted, top_k - 1, axis=1)[:, :top_k] \
+                                if top_k < len(classes) else np.tile(np.arange(len(classes)), (len(error_rows), 1))
+                            top_k_probs = np.take_along_axis(predicted, top_k_indices, axis=1)
+                            # Sorts the candidates by their probs in descending order (ties in the class order)
+                            order = np.lexsort((top_k_indices, -top_k_probs))
+                            top_k_indices = np.take_along_axis(top_k_indices, order, axis=1)
+                            top_k_probs = np.take_along_axis(top_k_probs, order, axis=1)
+                            for i in range(len(error_rows)):
+                                is_confident = (top_k_probs[i] > prob_threshold) & is_known[i]
+                                pmf_classes[i] = classes[top_k_indices[i][is_confident]].tolist()
+                                pmf_probs[i] = top_k_probs[i][is_confident]
+                        else:
+                            classes_list = classes.tolist()
+                            for i in range(len(error_rows)):
+                                pmf_classes[i] = classes_list if is_known[i] else []
+                                pmf_probs[i] = predicted[i] if is_known[i] else []
+
+                        most_probable = np.asarray(model.classes_)[np.argmax(predicted, axis=1)]
+                        most_probable = most_probable if y not in integral_column_map \
+                            else most_probable.astype(integral_column_map[y])
+                        if not is_known.all():
+                            most_probable = np.where(is_known, most_probable, None)
+                        pdf.iloc[error_rows, y_index] = most_probable
+                    else:
+                        predicted = model.predict(X)
+                        if inverse is not None:
+                            predicted = np.asarray(predicted)[inverse]
+                        predicted = predicted if y not in integral_column_map \
+                            else np.round(predicted).astype(integral_column_map[y])
+                        pdf.iloc[error_rows, y_index] = predicted
+
+                    # Note that the repaired values are kept in `pdf` because
+                    # the subsequent models might use them as features.
+                    if long_format:
+                        repaired_values = pdf[y].iloc[error_rows].values
+                        repaired_pdf = pd.DataFrame({
+                            row_id: pdf[row_id].iloc[error_rows].values,
+                            'attribute': y})
+                        if y in string_columns:
+                            repaired_pdf['repaired'] = repaired_values
+                            repaired_pdf['repaired_num'] = np.nan
+                        else:
+                            repaired_pdf['repaired'] = None
+                            repaired_pdf['repaired_num'] = pd.to_numeric(repaired_values).astype(np.float64)
+                        if need_to_compute_pmf:
+                            repaired_pdf['classes'] = pmf_classes if compute_pmf else None
+                            repaired_pdf['probs'] = pmf_probs if compute_pmf else None
+                        repaired_cells.append(repaired_pdf[columns])
+
+            if long_format:
+                return pd.concat(repaired_cells, ignore_index=True) if repaired_cells \
+                    else pd.DataFrame(columns=columns)
 
             return pdf[columns]
 
@@ -1139,10 +1956,24 @@ class RepairModel():
         # the likelihood benefits of the updates (likelihood benefit of an update, l).
         _logger.info(f"[Repairing Phase] Computing {error_cells_df.count()} repair updates in "
                      f"{dirty_rows_df.count()} rows...")
-        repaired_df = self._group_apply(dirty_rows_df, repair)
-        return repaired_df
-
-    def _compute_weighted_probs(self, pmf_df: DataFrame) -> DataFrame:
+        repaired_df = self._map_in_batches(dirty_rows_df, repair, output_schema)
+        if not long_format:
+            return repaired_df
+
+        # Casts the numeric repaired values into their original types before
+        # converting them into strings.
+        target_columns = [y for y, _ in models]
+        numeric_targets = [(f.name, f.dataType.simpleString()) for f in dirty_rows_df.schema.fields
+                           if f.name in target_columns and f.dataType != StringType()]
+        to_repaired_expr = "repaired"
+        if numeric_targets:
+            cases = " ".join([f"WHEN '{c}' THEN CAST(CAST(repaired_num AS {t}) AS STRING)" for c, t in numeric_targets])
+            to_repaired_expr = f"CASE attribute {cases} ELSE repaired END"
+
+        pmf_columns = ["classes", "probs"] if need_to_compute_pmf else []
+        return repaired_df.selectExpr(f"`{self._row_id}`", "attribute", f"{to_repaired_expr} repaired", *pmf_columns)
+
+    def _compute_weighted_probs(self, pmf_df: DataFrame, keep_costs: bool = False) -> DataFrame:
         assert self.cf is not None
 
         pmf_weight = float(self._get_option_value(*self._opt_cost_weight))
@@ -1157,93 +1988,91 @@ class RepairModel():
 
         sum_probs = "aggregate(probs, double(0.0), (acc, x) -> acc + x) norm"
         normalize_probs = "transform(probs, p -> p / norm) probs"
-        weighted_pmf_df = pmf_df.withColumn("costs", cost_func(col("current_value"), col("classes"))) \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "classes", f"{to_weighted_probs} probs") \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "classes", "probs", sum_probs) \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "classes", normalize_probs)
+        # If `keep_costs` is True, the computed costs are kept for the subsequent score computation
+        cost_columns = ["costs"] if keep_costs else []
+        weighted_pmf_df = pmf_df.withColumn("costs", cost_func("current_value", "classes")) \
+            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "classes", f"{to_weighted_probs} probs",
+                        *cost_columns) \
+            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "classes", "probs", sum_probs,
+                        *cost_columns) \
+            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "classes", normalize_probs,
+                        *cost_columns)
 
         return weighted_pmf_df
 
-    def _flatten(self, input_table: str) -> DataFrame:
-        jdf = self._jvm.RepairMiscApi.flattenTable("", input_table, self._row_id)
-        return DataFrame(jdf, self._spark._wrapped)  # type: ignore
-
     def _filter_columns_from(self, df: DataFrame, targets: List[str], negate: bool = False) -> DataFrame:
         return df.where("attribute {} ({})".format("NOT IN" if negate else "IN", to_list_str(targets, quote=True)))
 
-    def _compute_repair_pmf(self, repaired_rows_df: DataFrame, error_cells_df: DataFrame,
-                            continous_columns: List[str]) -> DataFrame:
-        # Extracts predicted cells from `repaired_rows_df`
-        repaired_cells_df = self._flatten(self._create_temp_view(repaired_rows_df, 'repaired')) \
-            .join(error_cells_df, [self._row_id, "attribute"], "inner")
-
-        # Since we cannot compute pmfs for continouos values, their columns need
-        # to be filtered out first.
-        discrete_repaired_cells_df = repaired_cells_df if len(continous_columns) == 0 \
-            else self._filter_columns_from(repaired_cells_df, continous_columns, negate=True)
-
-        parse_pmf_json_expr = "from_json(value, 'classes array<string>, probs array<double>') pmf"
-        slice_probs = "slice(pmf.probs, 1, size(pmf.classes)) probs"
+    def _compute_repair_pmf(self, repaired_cells_df: DataFrame, error_cells_df: DataFrame,
+                            continous_columns: List[str], pruned: bool = False,
+                            with_costs: bool = False) -> DataFrame:
+        # Since `repaired_cells_df` has only the predicted cells, joining it with
+        # `error_cells_df` just attaches the current values to them.
+        repaired_cells_df = repaired_cells_df.join(error_cells_df, [self._row_id, "attribute"], "inner")
+        discrete_repaired_cells_df = self._filter_columns_from(repaired_cells_df, continous_columns, negate=True) \
+            if len(continous_columns) > 0 else repaired_cells_df
         pmf_df = discrete_repaired_cells_df \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", parse_pmf_json_expr) \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "pmf.classes classes", slice_probs)
+            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "classes", "probs")
 
         # If `self.cf` defined, computes weighted probs using it
         if self.cf is not None:
-            pmf_df = self._compute_weighted_probs(pmf_df)
+            pmf_df = self._compute_weighted_probs(pmf_df, keep_costs=with_costs)
+
+        # If `with_costs` is True, the update costs from current values are attached to
+        # the candidates in `pmf` so that scores can be computed without evaluating the cost function again.
+        assert not with_costs or self.cf is not None
+        # Note that `arrays_zip` returns NULL if any input is NULL, so NULL costs are expanded into an array of NULLs.
+        cost_columns = ['coalesce(costs, array_repeat(CAST(NULL AS DOUBLE), size(classes))) cost'] if with_costs else []
+        pmf_zip_expr = 'arrays_zip(class, prob, cost) pmf' if with_costs else 'arrays_zip(class, prob) pmf'
 
         # Concatenates `classes` and `probs` for pmfs then sorts pmfs by their probs
         to_current_expr = "named_struct('value', current_value, 'prob', " \
             "coalesce(prob[array_position(class, current_value) - 1], 0.0)) current_value"
-        compare_probs = lambda x, y: \
-            f"case when {x}.prob < {y}.prob then 1 " \
-            f"when {x}.prob > {y}.prob then -1 " \
-            "else 0 end"
-        sorted_pmf_expr = f'array_sort(pmf, (left, right) -> {compare_probs("left", "right")}) pmf'
-        pmf_df = pmf_df.selectExpr(f"`{self._row_id}`", "attribute", 'current_value', 'classes class', 'probs prob') \
-            .selectExpr(f"`{self._row_id}`", "attribute", to_current_expr, 'arrays_zip(class, prob) pmf') \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", sorted_pmf_expr)
-
-        # Filters less-confident candidates in `pmf`
-        pmf_threshold = self._get_option_value(*self._opt_prob_threshold)
-        pmf_top_k = self._get_option_value(*self._opt_prob_top_k)
-        filtered_prob_expr = f"slice(filter(pmf, x -> x.prob > {pmf_threshold}), 1, {pmf_top_k}) pmf"
-        pmf_df = pmf_df.selectExpr(
-            f"`{self._row_id}`", "attribute", "current_value",
-            filtered_prob_expr)
+        pmf_df = pmf_df.selectExpr(f"`{self._row_id}`", "attribute", 'current_value', 'classes class', 'probs prob',
+                                   *cost_columns) \
+            .selectExpr(f"`{self._row_id}`", "attribute", to_current_expr, pmf_zip_expr)
+
+        # If the pmfs have been already pruned in the `repair` UDF, they are
+        # sorted and less-confident candidates are filtered out.
+        if not pruned:
+            compare_probs = lambda x, y: \
+                f"case when {x}.prob < {y}.prob then 1 " \
+                f"when {x}.prob > {y}.prob then -1 " \
+                "else 0 end"
+            sorted_pmf_expr = f'array_sort(pmf, (left, right) -> {compare_probs("left", "right")}) pmf'
+            pmf_df = pmf_df.selectExpr(f"`{self._row_id}`", "attribute", "current_value", sorted_pmf_expr)
+
+            # Filters less-confident candidates in `pmf`
+            pmf_threshold = self._get_option_value(*self._opt_prob_threshold)
+            pmf_top_k = self._get_option_value(*self._opt_prob_top_k)
+            filtered_prob_expr = f"slice(filter(pmf, x -> x.prob > {pmf_threshold}), 1, {pmf_top_k}) pmf"
+            pmf_df = pmf_df.selectExpr(
+                f"`{self._row_id}`", "attribute", "current_value",
+                filtered_prob_expr)
 
         # Appends rows for continous values if necessary
         if len(continous_columns) > 0:
             continous_repaired_cells_df = self._filter_columns_from(repaired_cells_df, continous_columns, negate=False)
-            continous_to_pmf_expr = "array(named_struct('class', value, 'prob', 1.0D)) pmf"
+            continous_to_pmf_expr = "array(named_struct('class', repaired, 'prob', 1.0D, " \
+                "'cost', CAST(NULL AS DOUBLE))) pmf" if with_costs \
+                else "array(named_struct('class', repaired, 'prob', 1.0D)) pmf"
             to_current_expr = "named_struct('value', current_value, 'prob', 0.0D) current_value"
             continous_pmf_df = continous_repaired_cells_df \
                 .selectExpr(f"`{self._row_id}`", "attribute", to_current_expr, continous_to_pmf_expr)
             pmf_df = pmf_df.union(continous_pmf_df)
 
-        assert pmf_df.count() == error_cells_df.count()
         return pmf_df
 
-    def _compute_score(self, pmf_df: DataFrame, error_cells_df: DataFrame) -> DataFrame:
-        assert self.cf is not None
-
-        broadcasted_cf = self._spark.sparkContext.broadcast(self.cf)
-
-        @functions.pandas_udf("double")  # type: ignore
-        def cost_func(xs: pd.Series, ys: pd.Series) -> pd.Series:
-            cf = broadcasted_cf.value
-            dists = [cf.compute(x, y) for x, y in zip(xs, ys)]
-            return pd.Series(dists)
-
-        maximal_likelihood_repair_expr = "named_struct('value', pmf[0].class, 'prob', pmf[0].prob) repaired"
-        current_expr = "IF(ISNOTNULL(current_value.value), current_value.value, repaired.value)"
-        score_expr = "ln(repaired.prob / IF(current_value.prob > 0.0, current_value.prob, 1e-6)) *" \
-            "(1.0 / (1.0 + coalesce(cost, 256.0))) score"
-        score_df = pmf_df \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", maximal_likelihood_repair_expr) \
-            .withColumn("cost", cost_func(expr(current_expr), col("repaired.value"))) \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value.value current_value",
-                        "repaired.value repaired", score_expr)
+    def _compute_score(self, pmf_df: DataFrame) -> DataFrame:
+        # Computes a score of the most probable candidate in a single projection; its update cost
+        # has been already computed when weighting the probs (See `_compute_repair_pmf` with `with_costs`).
+        # Note that repairing a NULL cell has no update cost.
+        likelihood_ratio_expr = "pmf[0].prob / IF(current_value.prob > 0.0, current_value.prob, 1e-6)"
+        cost_expr = "IF(ISNOTNULL(current_value.value), pmf[0].cost, 0.0D)"
+        score_expr = f"ln({likelihood_ratio_expr}) * (1.0 / (1.0 + coalesce({cost_expr}, 256.0))) score"
+        score_df = pmf_df.selectExpr(
+            f"`{self._row_id}`", "attribute", "current_value.value current_value",
+            "pmf[0].class repaired", score_expr)
 
         return score_df
 
@@ -1256,7 +2085,7 @@ class RepairModel():
             repair_updates, "", base_table, self._row_id)
         return DataFrame(jdf, self._spark._wrapped)  # type: ignore
 
-    def _maximal_likelihood_repair(self, score_df: DataFrame, error_cells_df: DataFrame) -> DataFrame:
+    def _maximal_likelihood_repair(self, score_df: DataFrame) -> DataFrame:
         # A “Maximal Likelihood Repair” problem defined in the SCARE [2] paper is as follows;
         # Given a scalar \delta and a database D = D_{e} \cup D_{c}, the problem is to
         # find another database instance D' = D'_{e} \cup D_{c} such that L(D'_{e} \| D_{c})
@@ -1264,25 +2093,62 @@ class RepairModel():
         # L is a likelihood function and Cost is an arbitrary update cost function
         # (e.g., edit distances) between the two database instances D and D'.
         assert self.repair_delta is not None
-        num_error_cells = error_cells_df.count()
-        percent = min(1.0, 1.0 - self.repair_delta / num_error_cells)
-        percentile = score_df.selectExpr(f"percentile(score, {percent}) thres").collect()[0]
-        top_delta_repairs_df = score_df.where(f"score >= {percentile.thres}").drop("score")
-        _logger.info("[Repairing Phase] {} repair updates (delta={}) selected "
-                     "among {} candidates".format(
-                         top_delta_repairs_df.count(),
-                         self.repair_delta,
-                         num_error_cells))
+
+        # Selects the top-`delta` repairs by bounded heaps in partitions (`TakeOrderedAndProject`)
+        # instead of an exact global percentile computed in a single reducer. Ties are broken by
+        # (row_id, attribute) so that exactly `delta` repairs are selected. Note that the selected
+        # repairs are kept in a lazy dataframe so as not to collect them into the driver.
+        top_delta_repairs_df = score_df \
+            .orderBy(col("score").desc_nulls_last(), col(self._row_id), col("attribute")) \
+            .limit(self.repair_delta) \
+            .drop("score")
+        _logger.info("[Repairing Phase] Top-{} repair updates selected".format(self.repair_delta))
 
         return top_delta_repairs_df
 
     # Since statistical models notoriously ignore specified integrity constraints,
     # this methods checks if constraints hold in the repair candidates.
     @spark_job_group(name="validating")
-    def _validate_repairs(self, repair_candidates: DataFrame, clean_rows: DataFrame) -> DataFrame:
+    def _validate_repairs(self, input_table: str, repair_candidates: DataFrame, clean_rows: DataFrame) -> DataFrame:
+        constraint_detectors = list(filter(lambda x: isinstance(x, ConstraintErrorDetector), self.error_detectors))
+        if not constraint_detectors:
+            _logger.warning("[Validation Phase] No constraint found, so skips validating repair candidates")
+            return repair_candidates.withColumn("rejected_reason", expr("CAST(NULL AS STRING)"))
+
+        # The repair candidates are referred to multiple times below, so they are persisted
+        # not to re-run the whole repair pipeline for each reference.
+        repair_candidates = repair_candidates.persist()
         _logger.info("[Validation Phase] Validating {} repair candidates...".format(repair_candidates.count()))
-        # TODO: Implements a logic to check if constraints hold on the repair candidates
-        return repair_candidates
+
+        # Applies the repair candidates into their rows and then checks if the constraints hold
+        # only between the repaired rows and their potential violators (the clean rows and the other repaired ones).
+        repair_updates_df = repair_candidates.where("repaired IS NOT NULL")
+        repaired_rows_df = self._repair_attrs(
+            repair_updates_df,
+            self._spark.table(input_table).join(repair_updates_df, self._row_id, "left_semi"))
+        reference_rows_df = clean_rows.join(repair_updates_df, self._row_id, "left_anti")
+        repaired_rows = self._create_temp_view(repaired_rows_df, "repaired_rows")
+        reference_rows = self._create_temp_view(reference_rows_df, "reference_rows")
+
+        dfs: List[DataFrame] = []
+        for d in constraint_detectors:
+            jdf = self._repair_api.validateRepairs(
+                repaired_rows, reference_rows, self._row_id,
+                d.constraint_path, d.constraints)  # type: ignore
+            dfs.append(DataFrame(jdf, self._spark._wrapped))  # type: ignore
+
+        rejected_cells_df = functools.reduce(lambda x, y: x.union(y), dfs) \
+            .groupBy(self._row_id, "attribute") \
+            .agg(expr("min(reason) rejected_reason"))
+        validated_df = repair_candidates.join(rejected_cells_df, [self._row_id, "attribute"], "left_outer") \
+            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "repaired", "rejected_reason") \
+            .cache()
+        _logger.info("[Validation Phase] {} repair candidates rejected".format(
+            validated_df.where("rejected_reason IS NOT NULL").count()))
+
+        # The validated result has been materialized, so the repair candidates can be released
+        repair_candidates.unpersist()
+        return validated_df
 
     @elapsed_time  # type: ignore
     def _run(self, input_table: str, continous_columns: List[str], detect_errors_only: bool,
@@ -1324,7 +2190,10 @@ class RepairModel():
 
         # Refines the repair base table to extract more clean data using a specified cost function
         if self.repair_by_rules:
-            error_cells_df, repaired_by_rules_df = self._repair_by_rules(repair_base_df, error_cells_df, target_columns)
+            nearest_value_domain_df, functional_dep_maps = \
+                self._compute_rule_based_repair_domains(repair_base_df, target_columns, domain_stats)
+            error_cells_df, repaired_by_rules_df = self._repair_by_rules(
+                repair_base_df, error_cells_df, nearest_value_domain_df, functional_dep_maps)
             repair_base_df = self._repair_attrs(repaired_by_rules_df, repair_base_df)
 
         # Selects rows for training, building models, and repairing cells
@@ -1339,11 +2208,21 @@ class RepairModel():
         # 3. Repair Phase
         #################################################################################
 
+        # The top-k candidates can be selected in the `repair` UDF only if the probs
+        # are not re-weighted by a cost function and a score does not need the prob
+        # of a current value.
+        prune_pmf = compute_repair_candidate_prob and not maximal_likelihood_repair and self.cf is None
+
+        # The predicted cells are output in a long format unless rows are necessary
+        long_format = not repair_data or maximal_likelihood_repair
+
         # TODO: Could we refine repair candidates by considering given integrity constraints? (See [15])
-        repaired_rows_df = self._repair(
+        repaired_df = self._repair(
             models, continous_columns, dirty_rows_df, error_cells_df,
             compute_repair_candidate_prob,
-            maximal_likelihood_repair)
+            maximal_likelihood_repair,
+            prune_pmf,
+            long_format)
 
         # If `compute_repair_candidate_prob` is True, returns probability mass function
         # of repair candidates.
@@ -1351,7 +2230,7 @@ class RepairModel():
             assert not self._repair_by_nearest_values_enabled, \
                 'repairing data by nearest values not supported in this path'
 
-            pmf_df = self._compute_repair_pmf(repaired_rows_df, error_cells_df, continous_columns)
+            pmf_df = self._compute_repair_pmf(repaired_df, error_cells_df, continous_columns, prune_pmf)
             pmf_df = pmf_df.selectExpr(f"`{self._row_id}`", "attribute", "current_value.value AS current_value", "pmf")
 
             # If `compute_repair_prob` is true, returns a predicted repair with
@@ -1374,39 +2253,186 @@ class RepairModel():
             assert not self._repair_by_nearest_values_enabled, \
                 'repairing data by nearest values not supported in this path'
 
-            pmf_df = self._compute_repair_pmf(repaired_rows_df, error_cells_df, [])
-            score_df = self._compute_score(pmf_df, error_cells_df)
+            pmf_df = self._compute_repair_pmf(repaired_df, error_cells_df, [], with_costs=True)
+            score_df = self._compute_score(pmf_df)
             if compute_repair_score:
                 return score_df
 
-            top_delta_repairs_df = self._maximal_likelihood_repair(score_df, error_cells_df)
+            top_delta_repairs_df = self._maximal_likelihood_repair(score_df)
             if not repair_data:
                 return top_delta_repairs_df
 
             # If `repair_data` is True, applys the selected repair updates into `dirty_rows`
-            repaired_rows_df = self._repair_attrs(
+            repaired_df = self._repair_attrs(
                 self._create_temp_view(top_delta_repairs_df, "top_delta_repairs"),
                 self._create_temp_view(dirty_rows_df, "dirty_rows"))
 
+        return self._collect_repairs(
+            input_table, clean_rows_df, repaired_df, error_cells_df,
+            repaired_by_rules_df if self.repair_by_rules else None,
+            repair_data)
+
+    def _collect_repairs(self, input_table: str, clean_rows_df: DataFrame, repaired_df: DataFrame,
+                         error_cells_df: DataFrame, repaired_by_rules_df: Optional[DataFrame],
+                         repair_data: bool) -> DataFrame:
+        # If `repair_data` is True, `repaired_df` has repaired rows; otherwise,
+        # it has repaired cells in a long format.
         if repair_data:
-            clean_df = clean_rows_df.union(repaired_rows_df)
+            clean_df = clean_rows_df.union(repaired_df)
             assert clean_df.count() == self._spark.table(input_table).count()
             return clean_df.cache()
 
         # If `repair_data` is False, returns repair candidates whoes
         # value is not the same with `current_value`.
-        repair_candidates_df = self._flatten(self._create_temp_view(repaired_rows_df, 'repaired')) \
+        repair_candidates_df = repaired_df \
             .join(error_cells_df, [self._row_id, "attribute"], "inner") \
-            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "value repaired") \
+            .selectExpr(f"`{self._row_id}`", "attribute", "current_value", "repaired") \
             .where("repaired IS NULL OR NOT(current_value <=> repaired)")
 
         repair_candidates_df = repair_candidates_df.union(repaired_by_rules_df) \
-            if self.repair_by_rules else repair_candidates_df
-        repair_candidates_df = self._validate_repairs(repair_candidates_df, clean_rows_df) \
+            if repaired_by_rules_df is not None else repair_candidates_df
+        repair_candidates_df = self._validate_repairs(input_table, repair_candidates_df, clean_rows_df) \
             if self.repair_validation_enabled else repair_candidates_df
 
         return repair_candidates_df.cache()
 
+    @elapsed_time  # type: ignore
+    def _train(self, input_table: str, continous_columns: List[str]) -> TrainedRepairModels:
+        _logger.info(f'[Error Detection Phase] Detecting errors in a table `{input_table}`... ')
+
+        error_cells_df, target_columns, pairwise_attr_stats, domain_stats = \
+            self._detect_errors(input_table, continous_columns)
+
+        if len(target_columns) == 0:
+            raise ValueError("At least one valid discretizable feature is needed to build repair models, "
+                             "but no such feature found")
+
+        error_cells_df = self._filter_columns_from(error_cells_df, target_columns)
+        repair_base_df = self._prepare_repair_base_cells(input_table, error_cells_df, target_columns)
+        nearest_value_domain_df: Optional[DataFrame] = None
+        functional_dep_maps: List[Tuple[str, str, DataFrame]] = []
+        if self.repair_by_rules:
+            # The domains for the rule-based repairs are cached and kept in the returned models
+            # so that `apply` does not need to compute them again on other input data.
+            nearest_value_domain_df, functional_dep_maps = \
+                self._compute_rule_based_repair_domains(repair_base_df, target_columns, domain_stats)
+            nearest_value_domain_df = nearest_value_domain_df.cache() \
+                if nearest_value_domain_df is not None else None
+            functional_dep_maps = [(x, y, df.cache()) for x, y, df in functional_dep_maps]
+            error_cells_df, repaired_by_rules_df = self._repair_by_rules(
+                repair_base_df, error_cells_df, nearest_value_domain_df, functional_dep_maps)
+            repair_base_df = self._repair_attrs(repaired_by_rules_df, repair_base_df)
+
+        models = self._build_repair_models(
+            repair_base_df, target_columns, continous_columns,
+            domain_stats, pairwise_attr_stats)
+
+        return TrainedRepairModels(models, target_columns, continous_columns, domain_stats,
+                                   nearest_value_domain_df, functional_dep_maps)
+
+    @elapsed_time  # type: ignore
+    def _apply(self, models: TrainedRepairModels, input_table: str, error_cells: str,
+               repair_data: bool) -> DataFrame:
+        target_columns = models.target_columns
+        error_cells_df = self._filter_columns_from(self._spark.table(error_cells), target_columns)
+        jdf = self._repair_api.withCurrentValues(
+            input_table, self._create_temp_view(error_cells_df, "error_cells"), self._row_id,
+            ",".join(target_columns))
+        error_cells_df = DataFrame(jdf, self._spark._wrapped)  # type: ignore
+
+        repair_base_df = self._prepare_repair_base_cells(input_table, error_cells_df, target_columns)
+        repaired_by_rules_df = None
+        if self.repair_by_rules:
+            # Reuses the domains for the rule-based repairs found in the training data
+            error_cells_df, repaired_by_rules_df = self._repair_by_rules(
+                repair_base_df, error_cells_df, models.nearest_value_domain_df, models.functional_dep_maps)
+            repair_base_df = self._repair_attrs(repaired_by_rules_df, repair_base_df)
+
+        clean_rows_df, dirty_rows_df = \
+            self._split_clean_and_dirty_rows(repair_base_df, error_cells_df)
+
+        _logger.info(f'[Repairing Phase] Applying {models} into a table `{input_table}`...')
+        repaired_df = self._repair(
+            models.models, models.continous_columns, dirty_rows_df, error_cells_df,
+            compute_repair_candidate_prob=False,
+            maximal_likelihood_repair=False,
+            long_format=not repair_data)
+
+        return self._collect_repairs(
+            input_table, clean_rows_df, repaired_df, error_cells_df,
+            repaired_by_rules_df, repair_data)
+
+    def train(self) -> TrainedRepairModels:
+        """
+        Detects error cells in given input data and builds statistical models to repair them.
+        The returned models can be applied into other input data having the same schema
+        by :meth:`RepairModel.apply` without detecting errors and training models again.
+
+        .. versionchanged:: 0.1.0
+
+        Examples
+        --------
+        >>> models = delphi.repair.setInput(spark.table("adult")).setRowId("tid").train()
+        >>> df = delphi.repair.setRowId("tid").apply(models, spark.table("adult_new"), spark.table("error_cells"))
+        >>> models.unpersist()
+        """
+        if self.input is None or self.row_id is None:
+            raise ValueError("`setInput` and `setRowId` should be called before training")
+
+        try:
+            input_table, continous_columns = self._check_input_table()
+            models, elapsed_time = self._train(input_table, continous_columns)
+            _logger.info(f"!!!Total Training time is {elapsed_time}(s)!!!")
+            return models
+        finally:
+            self._release_resources()
+
+    def apply(self, models: TrainedRepairModels, input: Union[str, DataFrame],
+              error_cells: Union[str, DataFrame], repair_data: bool = False) -> DataFrame:
+        """
+        Repairs given error cells in input data by using models built by :meth:`RepairModel.train`.
+        Since only inference runs in this method, the input data must have the same schema
+        with the data used to build the models.
+
+        .. versionchanged:: 0.1.0
+
+        Parameters
+        ----------
+        models : :class:`TrainedRepairModels`
+            repair models built by :meth:`RepairModel.train`.
+        input : str, :class:`DataFrame`
+            table/view name or :class:`DataFrame` to repair data.
+        error_cells : str, :class:`DataFrame`
+            table/view name or :class:`DataFrame` having error cells (`row_id`, `attribute`).
+        repair_data : bool
+            If set to ``True``, returns repaired input data (default: ``False``).
+        """
+        if not isinstance(models, TrainedRepairModels):
+            raise TypeError(f"`models` should be provided as TrainedRepairModels, got {type(models).__name__}")
+        if self.row_id is None:
+            raise ValueError("`setRowId` should be called before applying models")
+
+        try:
+            input_table = self._create_temp_view(input, "input") if type(input) is DataFrame else str(input)
+            ret_as_json = json.loads(self._repair_api.checkInputTable("", input_table, self._row_id))
+            input_table = ret_as_json["input_table"]
+
+            input_columns = self._spark.table(input_table).columns
+            missing_columns = [c for c in models.target_columns + models.features if c not in input_columns]
+            if missing_columns:
+                raise ValueError(f"Columns used in the models not found in {input_table}: "
+                                 f"{to_list_str(sorted(set(missing_columns)))}")
+
+            error_cells_df = error_cells if type(error_cells) is DataFrame else self._spark.table(str(error_cells))
+            error_cells_view = self._create_temp_view(
+                error_cells_df.selectExpr(f'`{self._row_id}`', 'attribute'), "error_cells")  # type: ignore
+
+            df, elapsed_time = self._apply(models, input_table, error_cells_view, repair_data)
+            _logger.info(f"!!!Total Processing time is {elapsed_time}(s)!!!")
+            return df
+        finally:
+            self._release_resources()
+
     def _check_input_table(self) -> Tuple[str, List[str]]:
         ret_as_json = json.loads(self._repair_api.checkInputTable(self.db_name, self._input_table, self._row_id))
         input_table = ret_as_json["input_table"]
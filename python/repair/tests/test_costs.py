@@ -16,8 +16,9 @@
 #
 
 import unittest
+import numpy as np
 
-from repair.costs import Levenshtein, UserDefinedUpdateCostFunction
+from repair.costs import JaroWinkler, Levenshtein, NumericDistance, QgramJaccard, UserDefinedUpdateCostFunction
 from repair.tests.testutils import ReusedSQLTestCase
 
 
@@ -41,6 +42,108 @@ class CostsTests(ReusedSQLTestCase):
         self.assertAlmostEqual(f.compute('1xx%', '100%'), f.compute('1xx%', '1%'))
         self.assertLess(f.compute('1xx%', '100%'), f.compute('1xx%', '2%'))
 
+    def test_JaroWinkler(self):
+        f = JaroWinkler()
+        self.assertAlmostEqual(f.compute('MARTHA', 'MARHTA'), 0.0389, places=4)
+        self.assertAlmostEqual(f.compute('DWAYNE', 'DUANE'), 0.16, places=4)
+        self.assertAlmostEqual(f.compute('abc', 'abc'), 0.0)
+        self.assertAlmostEqual(f.compute('abc', 'xyz'), 1.0)
+        self.assertAlmostEqual(f.compute(None, '123'), None)
+        self.assertAlmostEqual(f.compute('111', None), None)
+        self.assertLess(f.compute('1xx%', '100%'), f.compute('1xx%', 'abcdefg'))
+
+    def test_QgramJaccard(self):
+        f = QgramJaccard()
+        self.assertAlmostEqual(f.compute('abc', 'abd'), 2.0 / 3.0)
+        self.assertAlmostEqual(f.compute('abc', 'abc'), 0.0)
+        self.assertAlmostEqual(f.compute('a', 'a'), 0.0)
+        self.assertAlmostEqual(f.compute('ab', 'cd'), 1.0)
+        self.assertAlmostEqual(f.compute(None, '123'), None)
+        self.assertAlmostEqual(QgramJaccard(q=1).compute('abc', 'cab'), 0.0)
+        self.assertRaisesRegexp(
+            ValueError,
+            "`q` must be positive, but 0 got",
+            lambda: QgramJaccard(q=0))
+
+    def test_NumericDistance(self):
+        f = NumericDistance()
+        self.assertAlmostEqual(f.compute('1.5', '3'), 1.5)
+        self.assertAlmostEqual(f.compute(3, 1.5), 1.5)
+        self.assertAlmostEqual(f.compute('x', '3'), None)
+        self.assertAlmostEqual(f.compute(None, '3'), None)
+
+    def test_vectorized_UserDefinedUpdateCostFunction(self):
+        def distance(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+            return np.array([abs(len(x) - len(y)) for x, y in zip(xs, ys)], dtype=np.float64)
+
+        f = UserDefinedUpdateCostFunction(f=distance, vectorized=True)
+        self.assertAlmostEqual(f.compute('1', '123'), 2.0)
+        self.assertAlmostEqual(f.compute(None, '123'), None)
+        self.assertAlmostEqual(f.compute('111', None), None)
+        self.assertEqual(f.compute_batch(['1', None, '', 1.11], ['123', '1', '1', '1']), [2.0, None, None, 3.0])
+        self.assertEqual(f.compute_batch([], []), [])
+        self.assertEqual(
+            f.compute_cost_rows(['1', None, '22', ''], [['a', 'bb'], ['a'], ['ccc'], ['a']]),
+            [[0.0, 1.0], None, [1.0], None])
+
+        # If `f` fails on a batch, the costs are computed row by row and
+        # only the costs of the rows that `f` cannot handle are unknown
+        def distance_or_fail(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+            if 'bad' in xs:
+                raise ValueError('bad value found')
+            return np.array([abs(len(x) - len(y)) for x, y in zip(xs, ys)], dtype=np.float64)
+
+        f = UserDefinedUpdateCostFunction(f=distance_or_fail, vectorized=True)
+        self.assertEqual(f.compute_batch(['1', 'bad', '22'], ['123', '1', '1']), [2.0, None, 1.0])
+        self.assertEqual(f.compute_batch(['bad'], ['1']), [None])
+
+        self.assertRaisesRegexp(
+            ValueError,
+            "`f` should take two arrays and return an array of float cost values",
+            lambda: UserDefinedUpdateCostFunction(f=lambda x, y: 1.0, vectorized=True))
+
+    def test_compute_costs(self):
+        num_calls = []
+
+        def distance(x: str, y: str) -> float:
+            num_calls.append((x, y))
+            return float(abs(len(x) - len(y)))
+
+        f = UserDefinedUpdateCostFunction(f=distance)
+        domain = ['a', 'bb', 'ccc']
+        self.assertEqual(f.compute_costs('dd', domain), [1.0, 0.0, 1.0])
+        self.assertEqual(f.compute_costs(None, domain), [None, None, None])
+        num_calls.clear()
+        for _ in range(3):
+            self.assertEqual(f.compute_costs('dd', domain, cache_size=6), [1.0, 0.0, 1.0])
+        self.assertEqual(len(num_calls), 3)
+        self.assertEqual(f.compute_costs('e', domain, cache_size=6), [0.0, 1.0, 2.0])
+        self.assertEqual(f.compute_costs('fff', domain, cache_size=6), [2.0, 1.0, 0.0])
+        self.assertEqual(len(num_calls), 9)
+        # The least recently used pairs for 'dd' have been evicted
+        self.assertEqual(f.compute_costs('dd', domain, cache_size=6), [1.0, 0.0, 1.0])
+        self.assertEqual(len(num_calls), 12)
+
+        import cloudpickle
+        self.assertFalse(hasattr(cloudpickle.loads(cloudpickle.dumps(f)), '_cost_cache'))
+
+    def test_compute_expr(self):
+        self.spark.sparkContext._jvm.RepairApi.registerCostFunctions()
+        values = [('111', '123'), ('1xx%', '100%'), ('MARTHA', 'MARHTA'), ('1.11', '1.23'),
+                  ('a', 'abc'), ('abc', 'xyz'), ('', 'abc'), (None, 'abc'), ('abc', None)]
+        df = self.spark.createDataFrame(values, schema='x STRING, y STRING')
+        for f in [Levenshtein(), JaroWinkler(), QgramJaccard(), QgramJaccard(q=3), NumericDistance()]:
+            costs = df.selectExpr('x', 'y', f"{f.compute_expr('x', 'y')} cost").collect()
+            for x, y, cost in costs:
+                expected = f.compute(x, y)
+                if expected is None:
+                    self.assertIsNone(cost, msg=f'{f}: x={x} y={y}')
+                else:
+                    self.assertAlmostEqual(cost, expected, msg=f'{f}: x={x} y={y}')
+
+        f = UserDefinedUpdateCostFunction(f=lambda x, y: 1.0)
+        self.assertIsNone(f.compute_expr('x', 'y'))
+
     def test_UserDefinedUpdateCostFunction(self):
         import Levenshtein as l
         distance = lambda x, y: float(abs(len(str(x)) - len(str(y))) + l.distance(str(x), str(y)))
@@ -25,13 +25,14 @@ from pyspark import SparkConf
 from pyspark.sql import Row, functions as func
 from pyspark.sql.utils import AnalysisException
 
-from repair.costs import Levenshtein
+from repair.costs import Levenshtein, UserDefinedUpdateCostFunction
 from repair.errors import ConstraintErrorDetector, DomainValues, NullErrorDetector, RegExErrorDetector
 from repair.misc import RepairMisc
-from repair.model import FunctionalDepModel, RepairModel, PoorModel
+from repair.model import FunctionalDepModel, NaiveBayesModel, RepairModel, PoorModel, compile_encoder
 from repair.tests.requirements import have_pandas, have_pyarrow, \
     pandas_requirement_message, pyarrow_requirement_message
 from repair.tests.testutils import Eventually, ReusedSQLTestCase, load_testdata
+from repair.train import LgbBoosterModel
 
 
 @unittest.skipIf(
@@ -287,15 +288,29 @@ class RepairModelTests(ReusedSQLTestCase):
             ('error.pairwise_freq_ratio_threshold', '0.05'),
             ('model.max_training_row_num', '100000'),
             ('model.max_training_column_num', '65536'),
+            ('model.out_of_core_training.disabled', ''),
+            ('model.out_of_core_training.batch_size', '100000'),
+            ('model.distributed_training.disabled', ''),
+            ('model.distributed_training.num_workers', '2'),
             ('model.small_domain_threshold', '12'),
             ('model.rule.repair_by_nearest_values.disabled', '1'),
             ('model.rule.merge_threshold', '2.0'),
+            ('model.rule.qgram_size', '2'),
             ('model.rule.repair_by_regex.disabled', ''),
             ('model.rule.repair_by_functional_deps.disabled', ''),
             ('model.rule.max_domain_size', '1000'),
+            ('model.rule.discover_functional_deps.disabled', ''),
+            ('model.rule.fd_entropy_threshold', '0.05'),
+            ('model.rule.fd_min_confidence', '1.0'),
+            ('model.naive_bayes.disabled', ''),
+            ('model.naive_bayes.entropy_threshold', '0.1'),
+            ('model.naive_bayes.alpha', '1.0'),
             ('repair.pmf.cost_weight', '0.1'),
             ('repair.pmf.prob_threshold', '0.0'),
             ('repair.pmf.prob_top_k', '80'),
+            ('repair.udf.max_records_per_batch', '10000'),
+            ('repair.udf.dedup_inference.disabled', '1'),
+            ('repair.cost.cache_size', '1'),
             ('model.lgb.boosting_type', 'gbdt'),
             ('model.lgb.class_weight', 'balanced'),
             ('model.lgb.learning_rate', '0.01'),
@@ -376,6 +391,38 @@ class RepairModelTests(ReusedSQLTestCase):
             df.orderBy("tid", "attribute").collect(),
             self.expected_adult_result)
 
+    def test_out_of_core_training(self):
+        for parallel_stat_training_enabled in [False, True]:
+            test_model = self._build_model() \
+                .setTableName("adult") \
+                .setRowId("tid") \
+                .setParallelStatTrainingEnabled(parallel_stat_training_enabled) \
+                .option("model.max_training_row_num", "10") \
+                .option("model.out_of_core_training.disabled", "") \
+                .option("model.out_of_core_training.batch_size", "3")
+            df = test_model.run().orderBy("tid", "attribute")
+            self.assertEqual(
+                df.selectExpr("tid", "attribute", "current_value").collect(),
+                self.expected_adult_result_without_repaired)
+            self.assertTrue(all(r.repaired is not None for r in df.collect()))
+
+            # The models are re-built on the whole training data in both modes
+            models = test_model.train()
+            self.assertTrue(any(isinstance(m, LgbBoosterModel) for _, (m, _, _) in models.models))
+
+    def test_distributed_training(self):
+        test_model = self._build_model() \
+            .setTableName("adult") \
+            .setRowId("tid") \
+            .option("model.max_training_row_num", "10") \
+            .option("model.distributed_training.disabled", "") \
+            .option("model.distributed_training.num_workers", "2")
+        df = test_model.run().orderBy("tid", "attribute")
+        self.assertEqual(
+            df.selectExpr("tid", "attribute", "current_value").collect(),
+            self.expected_adult_result_without_repaired)
+        self.assertTrue(all(r.repaired is not None for r in df.collect()))
+
     def test_table_input(self):
         with self.table("adult_table"):
             # Tests for `setDbName`
@@ -467,6 +514,95 @@ class RepairModelTests(ReusedSQLTestCase):
         _test_setErrorCells(self.spark.table("adult_dirty"))
         _test_setErrorCells(self.spark.table("adult_dirty").withColumn('unrelated', func.expr('1')))
 
+    def test_dedup_inference(self):
+        test_model = self._build_model() \
+            .setTableName("adult") \
+            .setRowId("tid") \
+            .setErrorCells("adult_dirty") \
+            .option("repair.udf.dedup_inference.disabled", "")
+        self.assertEqual(
+            test_model.run().orderBy("tid", "attribute").collect(),
+            self.expected_adult_result)
+
+    def test_train_and_apply(self):
+        self.assertRaisesRegexp(
+            ValueError,
+            '`setInput` and `setRowId` should be called before training',
+            lambda: self._build_model().setRowId("tid").train())
+
+        test_model = self._build_model() \
+            .setTableName("adult") \
+            .setRowId("tid") \
+            .setErrorCells("adult_dirty")
+        models = test_model.train()
+        self.assertEqual(sorted(models.target_columns), ["Age", "Income", "Sex"])
+
+        def _test_apply(input, error_cells):
+            df = self._build_model().setRowId("tid").apply(models, input, error_cells)
+            self.assertEqual(df.orderBy("tid", "attribute").collect(), self.expected_adult_result)
+
+        _test_apply("adult", "adult_dirty")
+        _test_apply(self.spark.table("adult"), self.spark.table("adult_dirty"))
+
+        self.assertRaisesRegexp(
+            ValueError,
+            '`setRowId` should be called before applying models',
+            lambda: self._build_model().apply(models, "adult", "adult_dirty"))
+        self.assertRaisesRegexp(
+            ValueError,
+            'Columns used in the models not found in ',
+            lambda: self._build_model().setRowId("tid").apply(
+                models, self.spark.table("adult").drop("Age"), "adult_dirty"))
+
+    def test_train_and_apply_with_rules(self):
+        with self.tempView("inputView", "errorCells", "newInputView", "newErrorCells"):
+            rows = [
+                (1, "a", "abc"),
+                (2, "a", "abc"),
+                (3, "b", "xyz"),
+                (4, "b", "xyz"),
+                (5, "a", "abd")
+            ]
+            self.spark.createDataFrame(rows, ["tid", "x", "y"]) \
+                .createOrReplaceTempView("inputView")
+            self.spark.createDataFrame([(5, "y")], ["tid", "attribute"]) \
+                .createOrReplaceTempView("errorCells")
+
+            new_rows = [
+                (6, "b", "xyy"),
+                (7, "a", "abd")
+            ]
+            self.spark.createDataFrame(new_rows, ["tid", "x", "y"]) \
+                .createOrReplaceTempView("newInputView")
+            self.spark.createDataFrame([(6, "y"), (7, "y")], ["tid", "attribute"]) \
+                .createOrReplaceTempView("newErrorCells")
+
+            def _build_model_with_rules():
+                return self._build_model() \
+                    .setRowId("tid") \
+                    .setRepairByRules(True) \
+                    .setUpdateCostFunction(Levenshtein()) \
+                    .option("model.rule.repair_by_nearest_values.disabled", "")
+
+            models = _build_model_with_rules() \
+                .setTableName("inputView") \
+                .setErrorCells("errorCells") \
+                .train()
+            with models:
+                self.assertTrue(models.nearest_value_domain_df.is_cached)
+                self.assertEqual(models.nearest_value_domain_df.orderBy("attribute", "value").collect(), [
+                    Row(attribute="y", value="abc"),
+                    Row(attribute="y", value="xyz")])
+
+                # The new input has no clean value in `y`, so the domain found in the training data is used
+                df = _build_model_with_rules().apply(models, "newInputView", "newErrorCells")
+                self.assertEqual(df.orderBy("tid", "attribute").collect(), [
+                    Row(tid=6, attribute="y", current_value="xyy", repaired="xyz"),
+                    Row(tid=7, attribute="y", current_value="abd", repaired="abc")])
+
+            # The cached domains are released on exit
+            self.assertFalse(models.nearest_value_domain_df.is_cached)
+
     def test_setErrorCells_and_detect_errors_only(self):
         test_model = self._build_model() \
             .setTableName("adult") \
@@ -927,6 +1063,67 @@ class RepairModelTests(ReusedSQLTestCase):
                         Row(tid=5, attribute="y", current_value=None, repaired="test-2"),
                         Row(tid=6, attribute="y", current_value=None, repaired=None)])
 
+    def test_repair_by_functional_deps_with_large_domain(self):
+        with self.tempView("inputView", "errorCells"):
+            rows = [(i, str(i), f"test-{i}") for i in range(1, 13)] + [(13, "1", None), (14, "2", None)]
+            self.spark.createDataFrame(rows, ["tid", "x", "y"]) \
+                .createOrReplaceTempView("inputView")
+
+            self.spark.createDataFrame([(13, "y"), (14, "y")], ["tid", "attribute"]) \
+                .createOrReplaceTempView("errorCells")
+
+            with tempfile.NamedTemporaryFile("w+t") as f:
+                # Creates a file for constraints
+                f.write("t1&t2&EQ(t1.x,t2.x)&IQ(t1.y,t2.y)")
+                f.flush()
+
+                error_detectors = [
+                    NullErrorDetector(),
+                    ConstraintErrorDetector(f.name)
+                ]
+                # Since the domain size of `x` is larger than `model.rule.max_domain_size`,
+                # the error cells are repaired by joining them with the functional dep map.
+                test_model = self._build_model() \
+                    .setTableName("inputView") \
+                    .setRowId("tid") \
+                    .setErrorCells("errorCells") \
+                    .setErrorDetectors(error_detectors) \
+                    .setRepairByRules(True) \
+                    .option('model.rule.max_domain_size', '11')
+                self.assertEqual(
+                    test_model.run().orderBy("tid", "attribute").collect(), [
+                        Row(tid=13, attribute="y", current_value=None, repaired="test-1"),
+                        Row(tid=14, attribute="y", current_value=None, repaired="test-2")])
+
+    def test_repair_by_discovered_functional_deps(self):
+        with self.tempView("inputView", "errorCells"):
+            rows = [
+                (1, "1", "test-1"),
+                (2, "2", "test-2"),
+                (3, "1", None),
+                (4, "2", "test-2"),
+                (5, "2", None),
+                (6, "3", None)
+            ]
+            self.spark.createDataFrame(rows, ["tid", "x", "y"]) \
+                .createOrReplaceTempView("inputView")
+
+            self.spark.createDataFrame([(3, "y"), (5, "y"), (6, "y")], ["tid", "attribute"]) \
+                .createOrReplaceTempView("errorCells")
+
+            test_model = self._build_model() \
+                .setTableName("inputView") \
+                .setRowId("tid") \
+                .setErrorCells("errorCells") \
+                .setRepairByRules(True) \
+                .option('model.rule.discover_functional_deps.disabled', '') \
+                .option('model.rule.fd_entropy_threshold', '1.0')
+            self.assertEqual(
+                test_model.run().orderBy("tid", "attribute").collect(), [
+                    Row(tid=3, attribute="y", current_value=None, repaired="test-1"),
+                    Row(tid=5, attribute="y", current_value=None, repaired="test-2"),
+                    Row(tid=6, attribute="y", current_value=None, repaired=None)])
+
     def test_repair_by_nearest_values(self):
         with self.tempView("inputView", "errorCells"):
             rows = [
@@ -978,6 +1175,116 @@ class RepairModelTests(ReusedSQLTestCase):
                     Row(tid=6, attribute='v0', current_value='12x', repaired='32%'),
                     Row(tid=6, attribute='v1', current_value='300', repaired='100')])
 
+    def test_repair_by_nearest_values_with_duplicate_values(self):
+        with self.tempView("inputView", "errorCells"):
+            rows = [(i, "Birmingham" if i % 2 == 0 else "Manchester", "a") for i in range(10)] + \
+                [(i, "Birmingam", "b") for i in range(10, 15)] + [(15, None, "b")]
+            self.spark.createDataFrame(rows, "tid INT, v0 STRING, v1 STRING") \
+                .createOrReplaceTempView("inputView")
+
+            error_cells = [(i, "v0") for i in range(10, 16)]
+            self.spark.createDataFrame(error_cells, ["tid", "attribute"]) \
+                .createOrReplaceTempView("errorCells")
+            test_model = self._build_model() \
+                .setTableName("inputView") \
+                .setRowId("tid") \
+                .setTargets(["v0"]) \
+                .setErrorCells("errorCells") \
+                .setRepairByRules(True) \
+                .setUpdateCostFunction(Levenshtein()) \
+                .option("model.rule.repair_by_nearest_values.disabled", "") \
+                .option("model.rule.merge_threshold", "2.0")
+            self.assertEqual(
+                test_model.run().where("tid < 15").orderBy("tid", "attribute").collect(),
+                [Row(tid=i, attribute='v0', current_value='Birmingam', repaired='Birmingham') for i in range(10, 15)])
+
+    def test_repair_by_nearest_values_with_qgram_filter(self):
+        with self.tempView("inputView", "errorCells"):
+            rows = [
+                (1, "Computer Science", "a"),
+                (2, "Computer Engineering", "b"),
+                (3, "Electrical Engineering", "a"),
+                (4, "Mathematics", "b"),
+                (5, "Compter Sciense", "a"),
+                (6, "Electrcal Engineerin", "b"),
+                (7, "Computer Engneering", "a"),
+                (8, "Physics", "b"),
+                (9, "Math", "a")
+            ]
+            self.spark.createDataFrame(rows, ["tid", "v0", "v1"]) \
+                .createOrReplaceTempView("inputView")
+
+            error_cells = [(5, "v0"), (6, "v0"), (7, "v0"), (8, "v0"), (9, "v0")]
+            self.spark.createDataFrame(error_cells, ["tid", "attribute"]) \
+                .createOrReplaceTempView("errorCells")
+
+            import Levenshtein as l
+            distance = lambda x, y: float(l.distance(str(x), str(y)))
+
+            def run_test(cf, q):
+                return self._build_model() \
+                    .setTableName("inputView") \
+                    .setRowId("tid") \
+                    .setTargets(["v0"]) \
+                    .setErrorCells("errorCells") \
+                    .setRepairByRules(True) \
+                    .setUpdateCostFunction(cf) \
+                    .option("model.rule.repair_by_nearest_values.disabled", "") \
+                    .option("model.rule.merge_threshold", "2.0") \
+                    .option("model.rule.qgram_size", str(q)) \
+                    .run() \
+                    .where("tid IN (5, 6, 7)") \
+                    .orderBy("tid", "attribute") \
+                    .collect()
+
+            expected = run_test(UserDefinedUpdateCostFunction(f=distance), 2)
+            self.assertEqual(expected, [
+                Row(tid=5, attribute='v0', current_value='Compter Sciense', repaired='Computer Science'),
+                Row(tid=6, attribute='v0', current_value='Electrcal Engineerin', repaired='Electrical Engineering'),
+                Row(tid=7, attribute='v0', current_value='Computer Engneering', repaired='Computer Engineering')])
+            for q in [1, 2, 3]:
+                self.assertEqual(run_test(Levenshtein(), q), expected)
+
+    def test_repair_validation(self):
+        with self.tempView("inputView", "errorCells"):
+            rows = [
+                (1, "a", "abc"),
+                (2, "a", "abc"),
+                (3, "b", "xyz"),
+                (4, "b", "xyz"),
+                (5, "a", "xyy"),
+                (6, "c", "abd")
+            ]
+            self.spark.createDataFrame(rows, ["tid", "x", "y"]) \
+                .createOrReplaceTempView("inputView")
+
+            self.spark.createDataFrame([(5, "y"), (6, "y")], ["tid", "attribute"]) \
+                .createOrReplaceTempView("errorCells")
+
+            with tempfile.NamedTemporaryFile("w+t") as f:
+                # Creates a file for constraints
+                f.write("t1&t2&EQ(t1.x,t2.x)&IQ(t1.y,t2.y)")
+                f.flush()
+
+                test_model = self._build_model() \
+                    .setTableName("inputView") \
+                    .setRowId("tid") \
+                    .setErrorCells("errorCells") \
+                    .setErrorDetectors([ConstraintErrorDetector(f.name)]) \
+                    .setRepairByRules(True) \
+                    .setUpdateCostFunction(Levenshtein()) \
+                    .option("model.rule.repair_by_nearest_values.disabled", "")
+                self.assertEqual(
+                    test_model.run().orderBy("tid", "attribute").collect(), [
+                        Row(tid=5, attribute="y", current_value="xyy", repaired="xyz"),
+                        Row(tid=6, attribute="y", current_value="abd", repaired="abc")])
+                self.assertEqual(
+                    test_model.setRepairValidation(True).run().orderBy("tid", "attribute").collect(), [
+                        Row(tid=5, attribute="y", current_value="xyy", repaired="xyz",
+                            rejected_reason="violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+                        Row(tid=6, attribute="y", current_value="abd", repaired="abc",
+                            rejected_reason=None)])
+
     def test_repair_updates(self):
         expected_result = self.spark.table("adult_clean") \
             .orderBy("tid").collect()
@@ -1081,6 +1388,25 @@ class RepairModelTests(ReusedSQLTestCase):
             "struct<tid:int,attribute:string,current_value:string,"
             "repaired:string,score:double>")
 
+    def test_compute_repair_score_with_vectorized_cost_func(self):
+        import numpy as np
+        distance = lambda x, y: float(abs(len(x) - len(y)))
+        vectorized_distance = lambda xs, ys: \
+            np.abs(np.char.str_len(xs.astype(str)) - np.char.str_len(ys.astype(str))).astype(np.float64)
+
+        def run_test(cf):
+            return self._build_model() \
+                .setTableName("adult") \
+                .setRowId("tid") \
+                .setUpdateCostFunction(cf) \
+                .run(compute_repair_score=True) \
+                .orderBy("tid", "attribute") \
+                .collect()
+
+        self.assertEqual(
+            run_test(UserDefinedUpdateCostFunction(f=distance)),
+            run_test(UserDefinedUpdateCostFunction(f=vectorized_distance, vectorized=True)))
+
     def test_maximal_likelihood_repair(self):
         repaired_df = test_model = self._build_model() \
             .setTableName("adult") \
@@ -1094,6 +1420,16 @@ class RepairModelTests(ReusedSQLTestCase):
                 Row(tid=7, attribute="Sex", current_value=None, repaired="Male"),
                 Row(tid=12, attribute="Sex", current_value=None, repaired="Male")])
 
+    def test_maximal_likelihood_repair_with_exact_delta(self):
+        for delta in [1, 2]:
+            repaired_df = self._build_model() \
+                .setTableName("adult") \
+                .setRowId("tid") \
+                .setUpdateCostFunction(Levenshtein()) \
+                .setRepairDelta(delta) \
+                .run(maximal_likelihood_repair=True)
+            self.assertEqual(repaired_df.count(), delta)
+
     def test_compute_repair_prob_for_continouos_values(self):
         def run_test(f=lambda m: m):
             def _test(df, expected_schema):
@@ -1157,6 +1493,79 @@ class RepairModelTests(ReusedSQLTestCase):
         self.assertEqual(pmf[2].tolist(), [1.0, 0.0])
         self.assertIsNone(pmf[3])
 
+    def test_NaiveBayesModel(self):
+        class_counts = {"test-1": 3, "test-2": 1}
+        feature_counts = {"x": {"a": {"test-1": 3}, "b": {"test-2": 1}}}
+        model = NaiveBayesModel(["x"], class_counts, feature_counts)
+        pdf = pd.DataFrame([["b"], ["a"], ["c"], [None]], columns=["x"])
+        self.assertEqual(model.classes_.tolist(), ["test-1", "test-2"])
+        self.assertEqual(model.predict(pdf).tolist(), ["test-2", "test-1", "test-1", "test-1"])
+        pmf = model.predict_proba(pdf)
+        self.assertEqual(len(pmf), 4)
+        self.assertTrue(pmf[0][1] > pmf[0][0])
+        self.assertTrue(pmf[1][0] > pmf[1][1])
+        # Unknown values do not affect posteriors
+        self.assertEqual(pmf[2].tolist(), pmf[3].tolist())
+        self.assertAlmostEqual(pmf[2][0], 4.0 / 6.0)
+        self.assertAlmostEqual(sum(pmf[0]), 1.0)
+
+    def test_compile_encoder(self):
+        import category_encoders as ce
+        pdf = pd.DataFrame([["a", "x", 1.0], ["b", "y", 2.0], ["c", "x", None], [None, "z", 4.0]],
+                           columns=["v1", "v2", "v3"])
+        test_pdf = pd.DataFrame([["c", "z", 1.0], ["d", "x", 2.0], [None, "w", None], ["a", None, 3.0]],
+                                columns=["v1", "v2", "v3"])
+        encoders = [ce.SumEncoder(cols=["v1"], handle_unknown='impute'),
+                    ce.OrdinalEncoder(cols=["v2"], handle_unknown='impute')]
+        X = pdf
+        for encoder in encoders:
+            X_transformed = encoder.fit_transform(X)
+            compiled = compile_encoder(encoder, X, X_transformed)
+            self.assertEqual(compiled.__class__.__name__, "LookupTableEncoder")
+            pd.testing.assert_frame_equal(compiled.transform(test_pdf), encoder.transform(test_pdf))
+            test_pdf = encoder.transform(test_pdf)
+            X = X_transformed
+
+        # An encoder without `cols` is returned as it is
+        encoder = PoorModel(None)
+        self.assertIs(compile_encoder(encoder, pdf, pdf), encoder)
+
+    def test_naive_bayes_model(self):
+        test_model = self._build_model() \
+            .setTableName("adult") \
+            .setRowId("tid") \
+            .option("model.naive_bayes.disabled", "") \
+            .option("model.naive_bayes.entropy_threshold", "100.0")
+        df = test_model.run().orderBy("tid", "attribute")
+        self.assertEqual(
+            df.selectExpr("tid", "attribute", "current_value").collect(),
+            self.expected_adult_result_without_repaired)
+        self.assertTrue(all(r.repaired is not None for r in df.collect()))
+
+    def test_naive_bayes_model_with_large_domain(self):
+        with self.tempView("inputView", "errorCells"):
+            rows = [(i, f"id-{i}", str(i % 2), f"test-{i % 2}" if i % 5 != 0 else "test-2") for i in range(1, 21)] + \
+                [(21, "id-21", "0", None), (22, "id-22", "1", None)]
+            self.spark.createDataFrame(rows, ["tid", "id", "x", "y"]) \
+                .createOrReplaceTempView("inputView")
+
+            self.spark.createDataFrame([(21, "y"), (22, "y")], ["tid", "attribute"]) \
+                .createOrReplaceTempView("errorCells")
+
+            # Since the domain size of `id` is larger than `model.rule.max_domain_size`,
+            # the Naive Bayes model for `y` is built only from `x`.
+            test_model = self._build_model() \
+                .setTableName("inputView") \
+                .setRowId("tid") \
+                .setErrorCells("errorCells") \
+                .option("model.naive_bayes.disabled", "") \
+                .option("model.naive_bayes.entropy_threshold", "100.0") \
+                .option("model.rule.max_domain_size", "11")
+            models = dict(test_model.train().models)
+            model, features, _ = models["y"]
+            self.assertTrue(isinstance(model, NaiveBayesModel))
+            self.assertEqual(features, ["x"])
+
     def test_PoorModel(self):
         model = PoorModel(None)
         pdf = pd.DataFrame([[3], [1], [2], [4]], columns=["x"])
@@ -1215,6 +1624,49 @@ class RepairModelTests(ReusedSQLTestCase):
         self.assertTrue(rows[3].repaired is not None)
 
 
+@unittest.skipIf(
+    not have_pandas or not have_pyarrow,
+    pandas_requirement_message or pyarrow_requirement_message)  # type: ignore
+class RepairModelDistributedTrainingTests(ReusedSQLTestCase):
+
+    @classmethod
+    def master(cls):
+        # Launches two executors so that each LightGBM worker runs in a different process
+        return 'local-cluster[2,1,1024]'
+
+    @classmethod
+    def conf(cls):
+        return SparkConf() \
+            .set("spark.jars", os.getenv("REPAIR_API_LIB"))
+
+    @classmethod
+    def setUpClass(cls):
+        super(RepairModelDistributedTrainingTests, cls).setUpClass()
+        load_testdata(cls.spark, "adult.csv").createOrReplaceTempView("adult")
+        load_testdata(cls.spark, "adult_dirty.csv").createOrReplaceTempView("adult_dirty")
+
+    def test_distributed_training_on_shards(self):
+        test_model = RepairModel() \
+            .setTableName("adult") \
+            .setRowId("tid") \
+            .setErrorCells("adult_dirty") \
+            .setTargets(["Sex"]) \
+            .option("model.max_training_row_num", "10") \
+            .option("model.distributed_training.disabled", "") \
+            .option("model.distributed_training.num_workers", "2")
+
+        with self.assertLogs("repair.utils", level="INFO") as logs:
+            df = test_model.run()
+            self.assertTrue(all(r.repaired is not None for r in df.collect()))
+
+        # Each of the two workers has trained the model on its own non-empty shard
+        shard_logs = [m for m in logs.output if "shards in a barrier stage" in m]
+        self.assertEqual(len(shard_logs), 1)
+        shard_sizes = re.search(r"on (\d+) shards in a barrier stage \(#rows=([0-9,]+)\)", shard_logs[0])
+        self.assertEqual(shard_sizes.group(1), "2")
+        self.assertTrue(all(int(n) > 0 for n in shard_sizes.group(2).split(",")))
+
+
 if __name__ == "__main__":
     try:
         import xmlrunner
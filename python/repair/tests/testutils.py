@@ -71,9 +71,16 @@ class ReusedPySparkTestCase(unittest.TestCase):
         """
         return SparkConf()
 
+    @classmethod
+    def master(cls):
+        """
+        Override this in subclasses to run tests on a different cluster
+        """
+        return 'local[4]'
+
     @classmethod
     def setUpClass(cls):
-        cls.sc = SparkContext('local[4]', cls.__name__, conf=cls.conf())
+        cls.sc = SparkContext(cls.master(), cls.__name__, conf=cls.conf())
 
     @classmethod
     def tearDownClass(cls):
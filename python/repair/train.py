@@ -18,11 +18,15 @@
 #
 
 import copy
+import math
+import os
+import shutil
+import tempfile
 import time
 import numpy as np  # type: ignore[import]
 import pandas as pd  # type: ignore[import]
 from collections import namedtuple
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from repair.utils import elapsed_time, get_option_value, setup_logger
 
@@ -86,6 +90,96 @@ train_option_keys = [
 ]
 
 
+def _cgroup_cpu_limit() -> Optional[float]:
+    # cgroup v2
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+            if quota != "max":
+                return float(quota) / float(period)
+    except (OSError, ValueError):
+        pass
+
+    # cgroup v1
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota_us = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period_us = int(f.read())
+        if quota_us > 0 and period_us > 0:
+            return float(quota_us) / period_us
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def num_available_cores(n_jobs: int = -1) -> Tuple[int, str]:
+    """
+    Returns the number of cores that this process can use and how it is determined.
+    Note that Spark tasks should pass `spark.task.cpus` as `n_jobs` because
+    they cannot tell how many cores are assigned to them.
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))  # type: ignore
+        details = [f"affinity={cores}"]
+    except AttributeError:
+        cores = os.cpu_count() or 1
+        details = [f"cpu_count={cores}"]
+
+    cpu_limit = _cgroup_cpu_limit()
+    if cpu_limit is not None:
+        cores = min(cores, max(1, int(math.floor(cpu_limit))))
+        details.append(f"cgroup={cpu_limit}")
+
+    if n_jobs > 0:
+        cores = min(cores, n_jobs)
+        details.append(f"n_jobs={n_jobs}")
+
+    return cores, ",".join(details)
+
+
+def allocate_cores(n_jobs: int, n_splits: int) -> Tuple[int, int]:
+    """
+    Splits the available cores into fold-level parallelism (processes for cross-validation)
+    and tree-level parallelism (threads for each LightGBM model) so as not to oversubscribe them.
+    """
+    cores, details = num_available_cores(n_jobs)
+    fold_n_jobs = max(1, min(n_splits, cores))
+    tree_n_jobs = max(1, cores // fold_n_jobs)
+    _logger.info(f"Allocated {cores} cores ({details}) into {fold_n_jobs} folds x {tree_n_jobs} threads")
+    return fold_n_jobs, tree_n_jobs
+
+
+class LgbBoosterModel():
+    """
+    Model class to mimic the scikit-learn APIs on a LightGBM booster
+    that is built with the native training API.
+
+    .. versionchanged:: 0.1.0
+    """
+
+    def __init__(self, booster: Any, classes: Optional[List[Any]]) -> None:
+        self.booster = booster
+        self.classes = classes
+
+    @property
+    def classes_(self) -> Any:
+        return np.array(self.classes)
+
+    def predict(self, X: pd.DataFrame) -> Any:
+        if self.classes is None:
+            return self.booster.predict(X)
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def predict_proba(self, X: pd.DataFrame) -> Any:
+        probs = self.booster.predict(X)
+        # A binary classifier only returns the probabilities of the positive class
+        if probs.ndim == 1:
+            probs = np.vstack([1.0 - probs, probs]).T
+        return probs
+
+
 @elapsed_time  # type: ignore
 def _build_lgb_model(X: pd.DataFrame, y: pd.Series, is_discrete: bool, num_class: int, n_jobs: int,
                      opts: Dict[str, str]) -> Tuple[Any, float]:
@@ -99,6 +193,9 @@ def _build_lgb_model(X: pd.DataFrame, y: pd.Series, is_discrete: bool, num_class
     else:
         objective = "regression"
 
+    n_splits = int(_get_option_value(*_opt_n_splits))
+    fold_n_jobs, tree_n_jobs = allocate_cores(n_jobs, n_splits)
+
     fixed_params = {
         "boosting_type": _get_option_value(*_opt_boosting_type),
         "objective": objective,
@@ -111,7 +208,7 @@ def _build_lgb_model(X: pd.DataFrame, y: pd.Series, is_discrete: bool, num_class
         "n_estimators": _get_option_value(*_opt_n_estimators),
         "importance_type": _get_option_value(*_opt_importance_type),
         "random_state": 42,
-        "n_jobs": n_jobs
+        "n_jobs": tree_n_jobs
     }
 
     # Set `num_class` only in the `multiclass` mode
@@ -156,7 +253,6 @@ def _build_lgb_model(X: pd.DataFrame, y: pd.Series, is_discrete: bool, num_class
     }
 
     scorer = "f1_macro" if is_discrete else "neg_mean_squared_error"
-    n_splits = int(_get_option_value(*_opt_n_splits))
     cv = StratifiedKFold(n_splits=n_splits, shuffle=True) if is_discrete \
         else KFold(n_splits=n_splits, shuffle=True)
 
@@ -169,7 +265,7 @@ def _build_lgb_model(X: pd.DataFrame, y: pd.Series, is_discrete: bool, num_class
         try:
             # TODO: Replace with `lgb.cv` to remove the `sklearn` dependency
             scores = cross_val_score(
-                model, X, y, scoring=scorer, cv=cv, fit_params=fit_params, n_jobs=n_jobs)
+                model, X, y, scoring=scorer, cv=cv, fit_params=fit_params, n_jobs=fold_n_jobs)
             return -scores.mean()
 
         # it might throw an exception because `y` contains
@@ -213,6 +309,7 @@ def _build_lgb_model(X: pd.DataFrame, y: pd.Series, is_discrete: bool, num_class
         # Builds a model with `best_params`
         # TODO: Could we extract constraint rules (e.g., FD and CFD) from built statistical models?
         model = _create_model(best_params)
+        model.set_params(n_jobs=fold_n_jobs * tree_n_jobs)
         model.fit(X, y)
 
         def _feature_importances() -> List[Any]:
@@ -234,6 +331,127 @@ def build_model(X: pd.DataFrame, y: pd.Series, is_discrete: bool, num_class: int
     return _build_lgb_model(X, y, is_discrete, num_class, n_jobs, opts)
 
 
+def _to_booster_params(model: Any, classes: Optional[List[Any]], n_jobs: int) -> Tuple[Dict[str, Any], int]:
+    # Converts the params of a scikit-learn API model into the ones of the native training API
+    params = {k: v for k, v in model.get_params().items() if v is not None}
+    num_boost_round = int(params.pop("n_estimators"))
+    for k in ["class_weight", "importance_type", "silent", "n_jobs", "num_class"]:
+        params.pop(k, None)
+
+    if classes is not None:
+        params["objective"] = "binary" if len(classes) <= 2 else "multiclass"
+        if len(classes) > 2:
+            params["num_class"] = len(classes)
+
+    cores, details = num_available_cores(n_jobs)
+    _logger.info(f"Allocated {cores} cores ({details}) into LightGBM threads")
+    params["num_threads"] = cores
+    params["verbose"] = -1
+    return params, num_boost_round
+
+
+@elapsed_time  # type: ignore
+def _build_lgb_model_from_batches(batches: Iterable[pd.DataFrame], features: List[str], target: str,
+                                  transformers: List[Any], classes: Optional[List[Any]], base_model: Any,
+                                  n_jobs: int) -> Any:
+    import lightgbm as lgb  # type: ignore[import]
+
+    class _SpilledBatch(lgb.Sequence):
+        """Sequence to read a spilled batch of feature vectors via a memory-mapped file"""
+
+        def __init__(self, path: str, nrows: int) -> None:
+            self.path = path
+            self.nrows = nrows
+            self._data = None
+
+        def __getitem__(self, idx: Any) -> Any:
+            if self._data is None:
+                self._data = np.load(self.path, mmap_mode='r')
+            return self._data[idx]  # type: ignore
+
+        def __len__(self) -> int:
+            return self.nrows
+
+    params, num_boost_round = _to_booster_params(base_model, classes, n_jobs)
+    class_index = {c: i for i, c in enumerate(classes)} if classes is not None else None
+
+    # To bound memory usage, each batch is transformed into feature vectors and spilled
+    # into a local file; LightGBM reads them back in batches to construct its binned dataset.
+    spill_dir = tempfile.mkdtemp(prefix="repair-lgb-")
+    try:
+        seqs: List[Any] = []
+        labels: List[Any] = []
+        for i, pdf in enumerate(batches):
+            X = pdf[features]
+            for transformer in transformers:
+                X = transformer.transform(X)
+
+            path = os.path.join(spill_dir, f"batch-{i}.npy")
+            np.save(path, np.asarray(X, dtype=np.float64))
+            seqs.append(_SpilledBatch(path, len(X)))
+            labels.append(pdf[target].map(class_index).values if class_index is not None else pdf[target].values)
+
+        label = np.concatenate(labels).astype(np.float64)
+        weight = None
+        if classes is not None and base_model.get_params().get("class_weight") == "balanced":
+            counts = np.bincount(label.astype(np.int64), minlength=len(classes))
+            weight = (len(label) / (len(classes) * np.maximum(counts, 1)))[label.astype(np.int64)]
+
+        _logger.info("lightgbm: building a model from {} batches (#rows={})".format(len(seqs), len(label)))
+        train_set = lgb.Dataset(seqs, label=label, weight=weight, params=params)
+        booster = lgb.train(params, train_set, num_boost_round=num_boost_round)
+        return LgbBoosterModel(booster, classes)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+def build_model_from_batches(batches: Iterable[pd.DataFrame], features: List[str], target: str,
+                             transformers: List[Any], classes: Optional[List[Any]], base_model: Any,
+                             n_jobs: int) -> Tuple[Any, float]:
+    return _build_lgb_model_from_batches(batches, features, target, transformers, classes, base_model, n_jobs)
+
+
+def build_booster_on_shard(pdf: pd.DataFrame, features: List[str], target: str, transformers: List[Any],
+                           classes: Optional[List[Any]], class_weights: Optional[Dict[Any, float]],
+                           base_model: Any, machines: List[str], listen_port: int, n_jobs: int) -> str:
+    import lightgbm as lgb  # type: ignore[import]
+
+    if len(pdf) == 0:
+        raise ValueError("Training data shard should not be empty")
+
+    params, num_boost_round = _to_booster_params(base_model, classes, n_jobs)
+    if len(machines) > 1:
+        # Enables the socket-based data-parallel training over the given machines; each of them
+        # holds its own shard of training data, so `pre_partition` must be enabled.
+        params.update({
+            "tree_learner": "data",
+            "num_machines": len(machines),
+            "machines": ",".join(machines),
+            "local_listen_port": listen_port,
+            "pre_partition": True
+        })
+
+    X = pdf[features]
+    for transformer in transformers:
+        X = transformer.transform(X)
+
+    label = pdf[target].map({c: i for i, c in enumerate(classes)}).values if classes is not None \
+        else pdf[target].values
+    weight = pdf[target].map(class_weights).values if class_weights is not None else None
+    train_set = lgb.Dataset(np.asarray(X, dtype=np.float64), label=label.astype(np.float64),
+                            weight=weight, params=params)
+    booster = lgb.train(params, train_set, num_boost_round=num_boost_round)
+    if len(machines) > 1:
+        booster.free_network()
+
+    return booster.model_to_string()
+
+
+def load_booster_model(model_str: str, classes: Optional[List[Any]]) -> Any:
+    import lightgbm as lgb  # type: ignore[import]
+    return LgbBoosterModel(lgb.Booster(model_str=model_str), classes)
+
+
 def compute_class_nrow_stdv(y: pd.Series, is_discrete: bool) -> Optional[float]:
     from collections import Counter
     return float(np.std(list(map(lambda x: x[1], Counter(y).items())))) if is_discrete else None
@@ -23,8 +23,9 @@ import inspect
 import os
 import time
 import typing
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
+import pandas as pd  # type: ignore[import]
 from pyspark.sql import SparkSession
 
 
@@ -228,3 +229,21 @@ def elapsed_time(f):  # type: ignore
 
 def is_testing() -> bool:
     return os.environ.get("SPARK_TESTING") is not None
+
+
+def rebatch(pdfs: Iterable[pd.DataFrame], batch_size: int) -> Iterator[pd.DataFrame]:
+    """Splits and merges input pandas DataFrames into ones having `batch_size` rows (the last one can be smaller)"""
+    buffer: List[pd.DataFrame] = []
+    num_rows = 0
+    for pdf in pdfs:
+        while len(pdf) > 0:
+            n = min(batch_size - num_rows, len(pdf))
+            buffer.append(pdf.iloc[:n])
+            num_rows += n
+            pdf = pdf.iloc[n:]
+            if num_rows == batch_size:
+                yield pd.concat(buffer, ignore_index=True)
+                buffer, num_rows = [], 0
+
+    if buffer:
+        yield pd.concat(buffer, ignore_index=True)
@@ -298,21 +298,45 @@ private[python] object DepGraph extends RepairBase {
   }
 
   def computeFunctionalDepMap(inputView: String, X: String, Y: String): String = {
-    val x = getRandomString(prefix="x")
-    val y = getRandomString(prefix="y")
-    val df = spark.sql(
-      s"""
-         |SELECT CAST($X AS STRING) $x, CAST($y[0] AS STRING) $y FROM (
-         |  SELECT $X, collect_set($Y) $y
-         |  FROM $inputView
-         |  GROUP BY $X
-         |  HAVING size($y) = 1
-         |)
-       """.stripMargin)
+    computeFunctionalDepMap(inputView, X, Y, minConfidence = 1.0)
+  }
+
+  // Computes a map from `X` values to their most frequent `Y` values. Each entry is included only if
+  // the ratio of the rows having the `Y` value to the ones having the `X` value is greater than
+  // or equal to `minConfidence`; if `minConfidence` is 1.0, the map represents an exact functional
+  // dependency X->Y, otherwise an approximate one.
+  def computeFunctionalDepMap(inputView: String, X: String, Y: String, minConfidence: Double): String = {
+    val df = computeFunctionalDepMapAsDataFrame(inputView, X, Y, minConfidence)
 
     // TODO: We need a smarter way to convert Scala data to a json string
     df.collect.map { case Row(x: String, y: String) =>
       s""""$x": "$y""""
     }.mkString("{", ",", "}")
   }
+
+  // Returns the same map with `computeFunctionalDepMap` as a DataFrame having two string columns,
+  // `x` and `y`, so that callers can repair data by joining it without collecting it in a driver.
+  def computeFunctionalDepMapAsDataFrame(
+      inputView: String,
+      X: String,
+      Y: String,
+      minConfidence: Double): DataFrame = {
+    assert(0.0 < minConfidence && minConfidence <= 1.0, "minConfidence should be in (0.0, 1.0].")
+    val y = getRandomString(prefix="y")
+    val total = getRandomString(prefix="total")
+    spark.sql(
+      s"""
+         |SELECT CAST(`$X` AS STRING) x, CAST($y.v AS STRING) y FROM (
+         |  SELECT `$X`, max(named_struct('c', cnt, 'v', `$Y`)) $y, sum(cnt) $total
+         |  FROM (
+         |    SELECT `$X`, `$Y`, COUNT(1) cnt
+         |    FROM $inputView
+         |    WHERE `$X` IS NOT NULL AND `$Y` IS NOT NULL
+         |    GROUP BY `$X`, `$Y`
+         |  )
+         |  GROUP BY `$X`
+         |)
+         |WHERE $y.c >= $total * $minConfidence
+       """.stripMargin)
+  }
 }
@@ -17,14 +17,17 @@
 
 package org.apache.spark.api.python
 
+import scala.collection.mutable
 import scala.util.control.NonFatal
 
 import org.json4s._
 import org.json4s.jackson.JsonMethods._
 
-import org.apache.spark.python.RegexStructureRepair
+import org.apache.spark.python.{AttrRef, CostFunctions, DenialConstraints, RegexStructureRepair}
 import org.apache.spark.sql.ExceptionUtils.AnalysisException
 import org.apache.spark.sql._
+import org.apache.spark.sql.catalyst.encoders.RowEncoder
+import org.apache.spark.sql.types.{StringType, StructField}
 import org.apache.spark.util.RepairUtils._
 import org.apache.spark.util.{Utils => SparkUtils}
 
@@ -228,6 +231,17 @@ object RepairApi extends RepairBase {
     DepGraph.computeFunctionalDepMap(inputView, x, y)
   }
 
+  def computeFunctionalDepMap(inputView: String, x: String, y: String, minConfidence: Double): String = {
+    logBasedOnLevel(s"computeFunctionalDepMap called with: inputView=$inputView x=$x y=$y " +
+      s"minConfidence=$minConfidence")
+    DepGraph.computeFunctionalDepMap(inputView, x, y, minConfidence)
+  }
+
+  def computeFunctionalDepMapAsDataFrame(inputView: String, x: String, y: String): DataFrame = {
+    logBasedOnLevel(s"computeFunctionalDepMapAsDataFrame called with: inputView=$inputView x=$x y=$y")
+    DepGraph.computeFunctionalDepMapAsDataFrame(inputView, x, y, minConfidence = 1.0)
+  }
+
   private[python] def computeFreqStats(
       inputView: String,
       targetAttrSets: Seq[Seq[String]],
@@ -702,4 +716,128 @@ object RepairApi extends RepairBase {
         inputDf.withColumn("repaired", expr("string(null)"))
     }
   }
+
+  def repairByRegularExpressions(
+      regexsAsJson: String,
+      errCellView: String,
+      rowId: String): DataFrame = {
+    logBasedOnLevel(s"repairByRegularExpressions called with: " +
+      s"regexs=$regexsAsJson errCellView=$errCellView rowId=$rowId")
+
+    assert(checkSchema(errCellView, "attribute STRING, current_value STRING", rowId, strict = true))
+    assert(rowId.nonEmpty)
+
+    val regexs = {
+      val jsonObj = parse(regexsAsJson)
+      val data = jsonObj.asInstanceOf[JArray].values.asInstanceOf[Seq[Seq[String]]]
+      data.map { case Seq(attr, regex) => (attr, regex) }
+    }
+
+    // Compiles all the regexs only once; if multiple regexs are given for an attribute,
+    // the first one that can repair a value is used.
+    val repairMap = regexs.flatMap { case (attr, regex) =>
+      try {
+        Some((attr, RegexStructureRepair(regex)))
+      } catch {
+        case NonFatal(e) =>
+          logWarning(s"Repairing using regex '$regex' (attr='$attr') " +
+            s"failed because: ${e.getMessage}")
+          None
+      }
+    }.groupBy(_._1).map { case (attr, repairs) => (attr, repairs.map(_._2)) }
+
+    val inputDf = spark.table(errCellView).selectExpr(s"`$rowId`", "attribute", "current_value")
+    val outputSchema = inputDf.schema.add(StructField("repaired", StringType))
+    inputDf.mapPartitions { iter =>
+      // Memoizes repaired values in a partition because error cells often share the same values
+      val repairedValues = mutable.HashMap[(String, String), Option[String]]()
+      iter.map { row =>
+        val attr = row.getString(1)
+        val value = row.getString(2)
+        val repaired = repairMap.get(attr) match {
+          case Some(repairs) if value != null =>
+            repairedValues.getOrElseUpdate((attr, value), repairs.view.flatMap(_(value)).headOption)
+          case _ =>
+            None
+        }
+        Row(row.get(0), attr, value, repaired.orNull)
+      }
+    }(RowEncoder(outputSchema))
+  }
+
+  def validateRepairs(
+      repairedRowView: String,
+      referenceRowView: String,
+      rowId: String,
+      constraintFilePath: String,
+      constraints: String): DataFrame = {
+    logBasedOnLevel(s"validateRepairs called with: repairedRowView=$repairedRowView " +
+      s"referenceRowView=$referenceRowView rowId=$rowId constraintFilePath=$constraintFilePath " +
+      s"constraints=$constraints")
+
+    val repairedDf = spark.table(repairedRowView)
+    val rowIdType = repairedDf.schema.find(_.name == rowId).get.dataType.sql
+    val columns = repairedDf.columns.map(c => s"`$c`").mkString(",")
+    val constraintStmts = DenialConstraints.loadConstraintStmtsFromFile(constraintFilePath) ++
+      DenialConstraints.loadConstraintStmtsFromString(constraints)
+    val denialConstraints = DenialConstraints.parseAndVerifyConstraints(
+      constraintStmts, repairedRowView, repairedDf.columns.toSeq)
+    if (denialConstraints.predicates.isEmpty) {
+      createEmptyTable(s"`$rowId` $rowIdType, attribute STRING, reason STRING")
+    } else {
+      import DenialConstraints._
+      denialConstraints.predicates.map { preds =>
+        val attrs = preds.flatMap(_.references).distinct
+        val reason = {
+          val constraint = preds.map { p =>
+            val rightExpr = p.rightExpr match {
+              case ref: AttrRef => s"t2.$ref"
+              case constant => s"$constant"
+            }
+            s"${p.sign}(t1.${p.leftExpr},$rightExpr)"
+          }.mkString("&")
+          s"violates a denial constraint: $constraint"
+        }
+        // Repaired rows are checked only against their potential violators (the reference rows and
+        // the other repaired rows) joined by the equality predicates of each constraint, so the join is
+        // hash-partitioned on them and its cost grows with the number of repaired rows.
+        // Since predicates can be asymmetric (e.g., LT/GT), each repaired row is checked as both `t1` and `t2`.
+        val fromClauses = if (preds.exists(_.rightExpr.isInstanceOf[AttrRef])) {
+          val allRows = s"(SELECT $columns FROM $referenceRowView UNION ALL SELECT $columns FROM $repairedRowView)"
+          // A row never violates a constraint with itself
+          val joinCond = (preds.map(_.toString) :+
+            s"NOT($leftRelationIdent.`$rowId` <=> $rightRelationIdent.`$rowId`)").mkString(" AND ")
+          Seq(
+            leftRelationIdent ->
+              s"""
+                 |$repairedRowView AS $leftRelationIdent
+                 |JOIN $allRows AS $rightRelationIdent
+                 |ON $joinCond
+               """.stripMargin,
+            rightRelationIdent ->
+              s"""
+                 |$allRows AS $leftRelationIdent
+                 |JOIN $repairedRowView AS $rightRelationIdent
+                 |ON $joinCond
+               """.stripMargin)
+        } else {
+          Seq(leftRelationIdent -> s"$repairedRowView AS $leftRelationIdent WHERE ${preds.mkString(" AND ")}")
+        }
+        val attrsExpr = attrs.map(a => s"'$a'").mkString(",")
+        fromClauses.map { case (repairedRelationIdent, fromClause) =>
+          spark.sql(
+            s"""
+               |SELECT DISTINCT $repairedRelationIdent.`$rowId`, explode(array($attrsExpr)) attribute
+               |FROM $fromClause
+             """.stripMargin)
+        }.reduce(_.union(_))
+          .withColumn("reason", functions.lit(reason))
+      }.reduce(_.union(_))
+    }
+  }
+
+  def registerCostFunctions(): Unit = {
+    logBasedOnLevel("registerCostFunctions called")
+    CostFunctions.register(spark)
+  }
 }
@@ -0,0 +1,77 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *    http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.spark.python
+
+import org.apache.spark.sql.SparkSession
+
+/** Built-in update cost functions that can be evaluated in JVMs. */
+object CostFunctions {
+
+  private def jaroSimilarity(s1: String, s2: String): Double = {
+    if (s1.isEmpty && s2.isEmpty) {
+      1.0
+    } else {
+      val matchDistance = math.max(math.max(s1.length, s2.length) / 2 - 1, 0)
+      val s1Matches = new Array[Boolean](s1.length)
+      val s2Matches = new Array[Boolean](s2.length)
+      var numMatches = 0
+      s1.indices.foreach { i =>
+        var j = math.max(0, i - matchDistance)
+        val end = math.min(i + matchDistance + 1, s2.length)
+        while (j < end) {
+          if (!s2Matches(j) && s1(i) == s2(j)) {
+            s1Matches(i) = true
+            s2Matches(j) = true
+            numMatches += 1
+            j = end
+          } else {
+            j += 1
+          }
+        }
+      }
+
+      if (numMatches == 0) {
+        0.0
+      } else {
+        var numTranspositions = 0
+        var k = 0
+        s1.indices.filter(s1Matches).foreach { i =>
+          while (!s2Matches(k)) k += 1
+          if (s1(i) != s2(k)) numTranspositions += 1
+          k += 1
+        }
+        val m = numMatches.toDouble
+        (m / s1.length + m / s2.length + (m - numTranspositions / 2.0) / m) / 3.0
+      }
+    }
+  }
+
+  // Returns a Jaro-Winkler distance (1.0 - similarity) with a prefix scale 0.1
+  // and the maximum prefix length 4.
+  def jaroWinklerDistance(s1: String, s2: String): Double = {
+    val jaro = jaroSimilarity(s1, s2)
+    val prefix = s1.zip(s2).take(4).takeWhile { case (c1, c2) => c1 == c2 }.length
+    1.0 - (jaro + prefix * 0.1 * (1.0 - jaro))
+  }
+
+  def register(spark: SparkSession): Unit = {
+    spark.udf.register("jaro_winkler_distance", (s1: String, s2: String) => {
+      if (s1 != null && s2 != null) Some(jaroWinklerDistance(s1, s2)) else None
+    })
+  }
+}
@@ -23,7 +23,7 @@ import java.io.File
 import org.json4s._
 import org.json4s.jackson.JsonMethods._
 
-import org.apache.spark.sql.{AnalysisException, QueryTest}
+import org.apache.spark.sql.{AnalysisException, QueryTest, Row}
 import org.apache.spark.sql.catalyst.util.fileToString
 import org.apache.spark.sql.test.SharedSparkSession
 
@@ -285,6 +285,25 @@ class DepGraphSuite extends QueryTest with SharedSparkSession {
       val jsonObj = parse(jsonString)
       val data = jsonObj.asInstanceOf[JObject].values
       assert(data === Map("3" -> "test-3", "1" -> "test-1"))
+
+      val approxJsonString = DepGraph.computeFunctionalDepMap("tempView", "x", "y", 0.6)
+      val approxData = parse(approxJsonString).asInstanceOf[JObject].values
+      assert(approxData === Map("3" -> "test-3", "2" -> "test-2", "1" -> "test-1"))
+
+      val invalidConfidences = Seq(0.0, 1.1)
+      invalidConfidences.foreach { v =>
+        val errMsg = intercept[AssertionError] {
+          DepGraph.computeFunctionalDepMap("tempView", "x", "y", v)
+        }.getMessage
+        assert(errMsg.contains("minConfidence should be in (0.0, 1.0]."))
+      }
+
+      checkAnswer(
+        DepGraph.computeFunctionalDepMapAsDataFrame("tempView", "x", "y", 1.0),
+        Row("3", "test-3") :: Row("1", "test-1") :: Nil)
+      checkAnswer(
+        DepGraph.computeFunctionalDepMapAsDataFrame("tempView", "x", "y", 0.6),
+        Row("3", "test-3") :: Row("2", "test-2") :: Row("1", "test-1") :: Nil)
     }
   }
 }
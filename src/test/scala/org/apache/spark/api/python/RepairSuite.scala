@@ -545,4 +545,102 @@ class RepairSuite extends QueryTest with SharedSparkSession {
       }
     }
   }
+
+  test("validateRepairs") {
+    withTempView("repairedRows", "referenceRows") {
+      spark.sql(
+        s"""
+           |CREATE TEMPORARY VIEW repairedRows(tid, x, y, z) AS SELECT * FROM VALUES
+           |  (1, "a", "1", "p"),
+           |  (2, "b", "2", "q"),
+           |  (3, "c", "3", "r"),
+           |  (7, "e", "5", "v"),
+           |  (8, "e", "6", "w")
+         """.stripMargin)
+      spark.sql(
+        s"""
+           |CREATE TEMPORARY VIEW referenceRows(tid, x, y, z) AS SELECT * FROM VALUES
+           |  (4, "a", "1", "s"),
+           |  (5, "b", "3", "t"),
+           |  (6, "d", "4", "u")
+         """.stripMargin)
+
+      val df1 = RepairApi.validateRepairs("repairedRows", "referenceRows", "tid", "",
+        "t1&t2&EQ(t1.x,t2.x)&IQ(t1.y,t2.y)")
+      checkAnswer(df1, Seq(
+        Row(2, "x", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(2, "y", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(7, "x", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(7, "y", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(8, "x", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(8, "y", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)")
+      ))
+
+      val df2 = RepairApi.validateRepairs("repairedRows", "referenceRows", "tid", "",
+        "t1&EQ(t1.z,\"r\")&EQ(t1.y,\"3\");x->y")
+      checkAnswer(df2, Seq(
+        Row(3, "z", "violates a denial constraint: EQ(t1.z,\"r\")&EQ(t1.y,\"3\")"),
+        Row(3, "y", "violates a denial constraint: EQ(t1.z,\"r\")&EQ(t1.y,\"3\")"),
+        Row(2, "x", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(2, "y", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(7, "x", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(7, "y", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(8, "x", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)"),
+        Row(8, "y", "violates a denial constraint: EQ(t1.x,t2.x)&IQ(t1.y,t2.y)")
+      ))
+
+      // Repaired rows need to be checked as both `t1` and `t2` for asymmetric predicates
+      val df4 = RepairApi.validateRepairs("repairedRows", "referenceRows", "tid", "",
+        "t1&t2&EQ(t1.x,t2.x)&GT(t1.y,t2.y)")
+      checkAnswer(df4, Seq(
+        Row(2, "x", "violates a denial constraint: EQ(t1.x,t2.x)&GT(t1.y,t2.y)"),
+        Row(2, "y", "violates a denial constraint: EQ(t1.x,t2.x)&GT(t1.y,t2.y)"),
+        Row(7, "x", "violates a denial constraint: EQ(t1.x,t2.x)&GT(t1.y,t2.y)"),
+        Row(7, "y", "violates a denial constraint: EQ(t1.x,t2.x)&GT(t1.y,t2.y)"),
+        Row(8, "x", "violates a denial constraint: EQ(t1.x,t2.x)&GT(t1.y,t2.y)"),
+        Row(8, "y", "violates a denial constraint: EQ(t1.x,t2.x)&GT(t1.y,t2.y)")
+      ))
+
+      // A constraint only having equality predicates rejects conflicting repairs
+      // and keeps consistent ones; a repaired row never conflicts with itself.
+      val df5 = RepairApi.validateRepairs("repairedRows", "referenceRows", "tid", "",
+        "t1&t2&EQ(t1.y,t2.y)")
+      checkAnswer(df5, Seq(
+        Row(1, "y", "violates a denial constraint: EQ(t1.y,t2.y)"),
+        Row(3, "y", "violates a denial constraint: EQ(t1.y,t2.y)")
+      ))
+
+      val df3 = RepairApi.validateRepairs("repairedRows", "referenceRows", "tid", "", "")
+      assert(df3.count() === 0)
+      assert(df3.schema.map(_.name) === Seq("tid", "attribute", "reason"))
+    }
+  }
+
+  test("repairByRegularExpressions") {
+    Seq(("tid", "xx", "yy"), ("t i d", "x x", "y y")).foreach { case (tid, x, y) =>
+      withTempView("errCellView") {
+        spark.sql(
+          s"""
+             |CREATE TEMPORARY VIEW errCellView(`$tid`, attribute, current_value) AS SELECT * FROM VALUES
+             |  (1, "$x", "32 patxxnts"),
+             |  (2, "$x", "1xx patients"),
+             |  (3, "$x", null),
+             |  (4, "$x", "32 patxxnts"),
+             |  (3, "$y", "33x"),
+             |  (6, "$y", "yyy2")
+           """.stripMargin)
+
+        val regexs = s"""[["$x", "^[0-9]{1,3} patients$$"], ["$y", "^[0-9]{1,"], ["$y", "^[0-9]{1,3}%"]]"""
+        val df = RepairApi.repairByRegularExpressions(regexs, "errCellView", tid)
+        checkAnswer(df, Seq(
+          Row(1, x, "32 patxxnts", "32 patients"),
+          Row(2, x, "1xx patients", null),
+          Row(3, x, null, null),
+          Row(4, x, "32 patxxnts", "32 patients"),
+          Row(3, y, "33x", "33%"),
+          Row(6, y, "yyy2", null)
+        ))
+      }
+    }
+  }
 }
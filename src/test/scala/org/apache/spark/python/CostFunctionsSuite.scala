@@ -0,0 +1,36 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *    http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package org.apache.spark.python
+
+import org.apache.spark.SparkFunSuite
+
+class CostFunctionsSuite extends SparkFunSuite {
+
+  test("jaro-winkler distance") {
+    Seq(
+      ("MARTHA", "MARHTA", 0.0389),
+      ("DWAYNE", "DUANE", 0.16),
+      ("DIXON", "DICKSONX", 0.1867),
+      ("abc", "xyz", 1.0),
+      ("abc", "abc", 0.0),
+      ("", "", 0.0)).foreach { case (s1, s2, expected) =>
+      assert(math.abs(CostFunctions.jaroWinklerDistance(s1, s2) - expected) < 0.0001)
+      assert(math.abs(CostFunctions.jaroWinklerDistance(s2, s1) - expected) < 0.0001)
+    }
+  }
+}